@@ -3,8 +3,10 @@
 Complete demo of Multi-Party Smart Vault system
 """
 
+import io
 import sys
 import os
+from contextlib import redirect_stdout
 
 from src.vault import VaultMember, MultiPartyVault
 from src.rules import WithdrawalRules
@@ -26,8 +28,9 @@ def main():
     
     # Generate keys for participants
     participants = []
-    for name, share in [("Alice", 40), ("Bob", 35), ("Carol", 25)]:
-        private_hex, public_hex = BitcoinKey.generate_key_pair()
+    roster = [("Alice", 40), ("Bob", 35), ("Carol", 25)]
+    key_pairs = BitcoinKey.generate_key_pairs(len(roster))
+    for (name, share), (private_hex, public_hex) in zip(roster, key_pairs):
         participants.append({
             'name': name,
             'private_key': private_hex,
@@ -226,4 +229,10 @@ def main():
     print(f"   Token transfers: {len(token.get_transfer_history())}")
 
 if __name__ == "__main__":
-    main()
+    # Collect output in memory and write it once instead of per print()
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            main()
+    finally:
+        sys.stdout.write(buffer.getvalue())
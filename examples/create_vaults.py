@@ -16,8 +16,9 @@ def main():
     print("🔑 Generating Bitcoin keys for vault members...")
     members_data = []
     
-    for i, (name, share) in enumerate([("Alice", 40), ("Bob", 35), ("Carol", 25)]):
-        private_hex, public_hex = BitcoinKey.generate_key_pair()
+    roster = [("Alice", 40), ("Bob", 35), ("Carol", 25)]
+    key_pairs = BitcoinKey.generate_key_pairs(len(roster))
+    for (name, share), (private_hex, public_hex) in zip(roster, key_pairs):
         members_data.append({
             'name': name,
             'private_key': private_hex,
@@ -17,8 +17,8 @@ def main():
     
     # Generate keys
     keys_data = []
-    for name in ["Alice", "Bob", "Carol"]:
-        private_hex, public_hex = BitcoinKey.generate_key_pair()
+    names = ["Alice", "Bob", "Carol"]
+    for name, (private_hex, public_hex) in zip(names, BitcoinKey.generate_key_pairs(len(names))):
         keys_data.append({'name': name, 'private': private_hex, 'public': public_hex})
     
     # Create vault
@@ -3,6 +3,10 @@
 Example: Testing various withdrawal scenarios
 """
 
+import io
+import sys
+from contextlib import redirect_stdout
+
 from src.vault import VaultMember, MultiPartyVault
 from src.rules import WithdrawalRules
 from src.predicate import WithdrawalRequest
@@ -17,8 +21,8 @@ def main():
     
     # Generate keys
     keys_data = []
-    for name in ["Alice", "Bob", "Carol"]:
-        private_hex, public_hex = BitcoinKey.generate_key_pair()
+    names = ["Alice", "Bob", "Carol"]
+    for name, (private_hex, public_hex) in zip(names, BitcoinKey.generate_key_pairs(len(names))):
         keys_data.append({'name': name, 'private': private_hex, 'public': public_hex})
     
     # Create members
@@ -133,4 +137,10 @@ def main():
     print("🎯 Withdrawal testing complete!")
 
 if __name__ == "__main__":
-    main()
+    # Collect output in memory and write it once instead of per print()
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            main()
+    finally:
+        sys.stdout.write(buffer.getvalue())
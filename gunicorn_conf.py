@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for the web interface
+
+Run from the repository root:
+    gunicorn -c gunicorn_conf.py web_interface.app:app
+"""
+
+import multiprocessing
+import os
+
+# The app is loaded once in the master (preload_app below) and its pages
+# shared copy-on-write by the forked workers. It creates locks and queues
+# at import, so the stdlib is patched first, as each worker would anyway.
+from gevent import monkey
+monkey.patch_all()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 10000)}"
+
+# Each gevent worker multiplexes many connections on greenlets
+worker_class = "gevent"
+worker_connections = 1000
+
+preload_app = True
+
+# Let polling dashboards reuse their connection between requests
+keepalive = 5
+
+# In-process vault storage is per worker; scale out only with shared Redis
+if os.environ.get('VAULT_REDIS_URL'):
+    workers = multiprocessing.cpu_count() * 2 + 1
+else:
+    workers = 1
@@ -7,7 +7,7 @@ from .vault import Vault, VaultMember, MultiPartyVault
 from .rules import WithdrawalRules
 from .predicate import VaultPredicate, WithdrawalRequest
 
-__version__ = "0.1.0"
+__version__ = "0.2.0"
 __all__ = [
     "Vault", 
     "VaultMember", 
@@ -3,64 +3,90 @@ Bitcoin integration utilities
 """
 
 import hashlib
-from ecdsa import SigningKey, SECP256k1, VerifyingKey
-from typing import Tuple
+import secrets
+import sys
+from typing import List, Tuple
+
+_sha256 = hashlib.sha256
+
+try:
+    hashlib.new('ripemd160')
+    _HAS_RIPEMD160 = True
+except ValueError:
+    # OpenSSL 3 builds without the legacy provider don't ship RIPEMD160
+    _HAS_RIPEMD160 = False
+
+# Below this many keys, process start-up costs more than the keygen itself
+PARALLEL_KEYGEN_THRESHOLD = 1024
+
+def canonical_pubkey(pubkey_hex: str) -> str:
+    """Canonical (lowercase, interned) form of a hex public key
+    
+    Interned strings are shared across members, signers and token
+    balances, so equality and dict/set lookups hit the cached hash.
+    """
+    return sys.intern(pubkey_hex.lower())
 
 class BitcoinKey:
-    """Bitcoin key management utilities"""
+    """Bitcoin key management utilities (libsecp256k1 via coincurve)"""
     
     def __init__(self, private_key: bytes = None):
+        # coincurve is imported on first use to keep `import src` cheap
+        from coincurve import PrivateKey
+        
         if private_key:
-            self.private_key = SigningKey.from_string(private_key, curve=SECP256k1)
+            self.private_key = PrivateKey(private_key)
         else:
-            self.private_key = SigningKey.generate(curve=SECP256k1)
+            self.private_key = PrivateKey()
         
-        self.public_key = self.private_key.get_verifying_key()
+        self.public_key = self.private_key.public_key
     
     def get_public_key_hex(self) -> str:
         """Get compressed public key in hex format"""
-        # Get uncompressed public key point
-        point = self.public_key.pubkey.point
-        
-        # Compress the public key
-        x = point.x()
-        y = point.y()
-        
-        # Determine prefix (02 for even y, 03 for odd y)
-        prefix = b'\x02' if y % 2 == 0 else b'\x03'
-        
-        # Convert x coordinate to 32 bytes
-        x_bytes = x.to_bytes(32, 'big')
-        
-        # Return compressed public key
-        return (prefix + x_bytes).hex()
+        # libsecp256k1 emits the 33-byte compressed form (02/03 prefix + x)
+        return self.public_key.format(compressed=True).hex()
     
     def sign_message(self, message: bytes) -> str:
-        """Sign message and return signature in hex"""
+        """Sign message and return DER signature in hex"""
         signature = self.private_key.sign(message)
         return signature.hex()
     
     def verify_signature(self, message: bytes, signature_hex: str, pubkey_hex: str) -> bool:
         """Verify signature against message and public key"""
+        from coincurve import PublicKey
+        
         try:
-            # Parse public key
-            pubkey_bytes = bytes.fromhex(pubkey_hex)
+            # Accepts both compressed (33 byte) and uncompressed (65 byte) keys
+            vk = PublicKey(bytes.fromhex(pubkey_hex))
+            signature = bytes.fromhex(signature_hex)
+            return vk.verify(signature, message)
             
-            # Handle compressed public key
-            if len(pubkey_bytes) == 33:
-                # Decompress public key (simplified)
-                prefix = pubkey_bytes[0]
-                x = int.from_bytes(pubkey_bytes[1:], 'big')
+        except Exception:
+            return False
+    
+    @staticmethod
+    def verify_batch(messages: List[bytes], signatures_hex: List[str], pubkeys_hex: List[str]) -> bool:
+        """Verify (message, signature, pubkey) triples in a single call
+        
+        Each distinct public key is parsed once and every check runs on
+        libsecp256k1's shared context. Returns False if any triple fails.
+        """
+        if not (len(messages) == len(signatures_hex) == len(pubkeys_hex)):
+            return False
+        
+        from coincurve import PublicKey
+        
+        parsed_keys = {}
+        try:
+            for message, signature_hex, pubkey_hex in zip(messages, signatures_hex, pubkeys_hex):
+                vk = parsed_keys.get(pubkey_hex)
+                if vk is None:
+                    vk = parsed_keys[pubkey_hex] = PublicKey(bytes.fromhex(pubkey_hex))
                 
-                # This is a simplified decompression - in production use proper secp256k1 library
-                # For now, create a mock verifying key
-                vk = self.public_key  # Use current key for demo
-            else:
-                # Uncompressed key
-                vk = VerifyingKey.from_string(pubkey_bytes, curve=SECP256k1)
+                if not vk.verify(bytes.fromhex(signature_hex), message):
+                    return False
             
-            signature = bytes.fromhex(signature_hex)
-            return vk.verify(signature, message)
+            return True
             
         except Exception:
             return False
@@ -69,19 +95,58 @@ class BitcoinKey:
     def generate_key_pair() -> Tuple[str, str]:
         """Generate new key pair and return (private_key_hex, public_key_hex)"""
         key = BitcoinKey()
-        private_hex = key.private_key.to_string().hex()
+        private_hex = key.private_key.secret.hex()
         public_hex = key.get_public_key_hex()
         return private_hex, public_hex
     
+    @staticmethod
+    def generate_key_pairs(count: int) -> List[Tuple[str, str]]:
+        """Generate `count` independent key pairs, in parallel for large batches"""
+        if count < PARALLEL_KEYGEN_THRESHOLD:
+            return _generate_key_pair_batch(count)
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(_generate_key_pair, range(count), chunksize=256))
+    
     @staticmethod
     def hash160(data: bytes) -> bytes:
         """Bitcoin HASH160 (RIPEMD160(SHA256(data)))"""
-        sha256_hash = hashlib.sha256(data).digest()
-        # Python doesn't have RIPEMD160 in hashlib by default
-        # Using SHA256 as substitute for demo
-        return hashlib.sha256(sha256_hash).digest()[:20]
+        sha256_hash = _sha256(data).digest()
+        if _HAS_RIPEMD160:
+            return hashlib.new('ripemd160', sha256_hash).digest()
+        
+        # RIPEMD160 unavailable - using SHA256 as substitute for demo
+        return _sha256(sha256_hash).digest()[:20]
     
     @staticmethod
     def double_sha256(data: bytes) -> bytes:
         """Bitcoin double SHA256"""
-        return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+        return _sha256(_sha256(data).digest()).digest()
+
+def _generate_key_pair_batch(count: int) -> List[Tuple[str, str]]:
+    """Key pairs from one bulk read of the OS CSPRNG
+    
+    Public keys are derived straight from each secret, skipping the
+    per-key PrivateKey object and its separate entropy draw.
+    """
+    from coincurve import PublicKey
+    
+    from_secret = PublicKey.from_secret
+    entropy = memoryview(secrets.token_bytes(32 * count))
+    pairs = []
+    for offset in range(0, 32 * count, 32):
+        secret = bytes(entropy[offset:offset + 32])
+        try:
+            public_key = from_secret(secret)
+        except ValueError:
+            # Secret was zero or >= the curve order (probability ~2**-128)
+            pairs.append(BitcoinKey.generate_key_pair())
+            continue
+        pairs.append((secret.hex(), public_key.format(compressed=True).hex()))
+    return pairs
+
+def _generate_key_pair(_index: int) -> Tuple[str, str]:
+    # Top-level so ProcessPoolExecutor can pickle it
+    return BitcoinKey.generate_key_pair()
@@ -5,25 +5,26 @@ BOS-aligned interface for vault governance and tokenization
 
 import hashlib
 import json
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
+import sys
+from dataclasses import dataclass, asdict, field
+from typing import List, Dict, Any, Optional, Set, Iterator
 from enum import Enum
 
-class ProposalType(Enum):
+class ProposalType(str, Enum):
     CHANGE_WITHDRAWAL_RULES = "change_withdrawal_rules"
     ADD_MEMBER = "add_member"
     REMOVE_MEMBER = "remove_member"
     EMERGENCY_EXIT = "emergency_exit"
     UPGRADE_VAULT = "upgrade_vault"
 
-class ProposalStatus(Enum):
+class ProposalStatus(str, Enum):
     PENDING = "pending"
     ACTIVE = "active"
     PASSED = "passed"
     REJECTED = "rejected"
     EXECUTED = "executed"
 
-@dataclass
+@dataclass(slots=True)
 class TokenMetadata:
     """Charms token metadata"""
     name: str
@@ -32,23 +33,92 @@ class TokenMetadata:
     vault_type: str
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class TokenAllocation:
     """Token allocation to vault member"""
     recipient: str  # public key
     amount: int
     share_percentage: int
 
+class IncrementalMerkle:
+    """Append-only Merkle tree that keeps only its frontier
+    
+    Uses Bitcoin-style padding (an unpaired last node is hashed with
+    itself). Append and root are O(log N) time and the tree holds
+    O(log N) hashes, so history never has to be rehashed in full.
+    """
+    
+    __slots__ = ('_hash', '_frontier', '_count')
+    
+    def __init__(self, hash_fn=hashlib.sha256):
+        self._hash = hash_fn
+        self._frontier = []  # level -> root of completed left subtree
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, leaf_data: bytes):
+        """Add a leaf, merging completed subtrees up the spine"""
+        node = self._hash(leaf_data).digest()
+        level = 0
+        index = self._count
+        
+        while index & 1:
+            node = self._hash(self._frontier[level] + node).digest()
+            index >>= 1
+            level += 1
+        
+        if level == len(self._frontier):
+            self._frontier.append(node)
+        else:
+            self._frontier[level] = node
+        self._count += 1
+    
+    def root(self) -> bytes:
+        """Current Merkle root (32 zero bytes for an empty tree)"""
+        count = self._count
+        if count == 0:
+            return bytes(32)
+        
+        # Rightmost node starts at the smallest completed subtree
+        level = (count & -count).bit_length() - 1
+        node = self._frontier[level]
+        
+        # Nodes remaining at this level: ceil(count / 2**level)
+        width = count >> level
+        while width > 1:
+            if width & 1:
+                node = self._hash(node + node).digest()
+            else:
+                node = self._hash(self._frontier[level] + node).digest()
+            level += 1
+            width = (count + (1 << level) - 1) >> level
+        
+        return node
+
 class VaultToken:
     """Charms-compatible token representing vault shares"""
     
+    __slots__ = (
+        'vault_id', 'total_supply', 'metadata', '_inv_supply_pct',
+        '_balances', '_allowances', '_tx_from', '_tx_to', '_tx_amount', '_tx_ts',
+        '_transfer_merkle'
+    )
+    
     def __init__(self, vault_id: str, total_supply: int, metadata: TokenMetadata):
         self.vault_id = vault_id
         self.total_supply = total_supply
         self.metadata = metadata
+        self._inv_supply_pct = 100.0 / total_supply  # balance -> percentage multiplier
         self._balances = {}  # pubkey -> balance
-        self._allowances = {}  # owner -> spender -> amount
-        self._transfer_history = []
+        self._allowances = {}  # (owner, spender) -> amount
+        # Transfer history as parallel columns; dicts are built only on read
+        self._tx_from = []
+        self._tx_to = []
+        self._tx_amount = []
+        self._tx_ts = []
+        self._transfer_merkle = IncrementalMerkle()
     
     @classmethod
     def create_for_vault(cls, vault: 'Vault') -> 'VaultToken':
@@ -73,19 +143,17 @@ class VaultToken:
     def _mint_initial_tokens(self, vault: 'Vault') -> List[TokenAllocation]:
         """Mint initial tokens to vault members"""
         
-        allocations = []
-        
-        for member in vault.members:
-            token_amount = (self.total_supply * member.share_percentage) // 100
-            self._balances[member.pubkey] = token_amount
-            
-            allocation = TokenAllocation(
+        total_supply = self.total_supply
+        allocations = [
+            TokenAllocation(
                 recipient=member.pubkey,
-                amount=token_amount,
+                amount=(total_supply * member.share_percentage) // 100,
                 share_percentage=member.share_percentage
             )
-            allocations.append(allocation)
+            for member in vault.members
+        ]
         
+        self._balances.update((a.recipient, a.amount) for a in allocations)
         return allocations
     
     def balance_of(self, pubkey: str) -> int:
@@ -107,27 +175,23 @@ class VaultToken:
         self._balances[to_pubkey] = self.balance_of(to_pubkey) + amount
         
         # Record transfer
-        self._transfer_history.append({
-            'from': from_pubkey,
-            'to': to_pubkey,
-            'amount': amount,
-            'timestamp': len(self._transfer_history)  # Mock timestamp
-        })
+        timestamp = len(self._tx_ts)  # Mock timestamp
+        self._tx_from.append(from_pubkey)
+        self._tx_to.append(to_pubkey)
+        self._tx_amount.append(amount)
+        self._tx_ts.append(timestamp)
+        self._transfer_merkle.append(f"{from_pubkey}:{to_pubkey}:{amount}:{timestamp}".encode())
         
         return True
     
     def approve(self, owner: str, spender: str, amount: int) -> bool:
         """Approve spender to transfer tokens on behalf of owner"""
-        
-        if owner not in self._allowances:
-            self._allowances[owner] = {}
-        
-        self._allowances[owner][spender] = amount
+        self._allowances[(owner, spender)] = amount
         return True
     
     def allowance(self, owner: str, spender: str) -> int:
         """Get approved allowance"""
-        return self._allowances.get(owner, {}).get(spender, 0)
+        return self._allowances.get((owner, spender), 0)
     
     def transfer_from(self, spender: str, from_pubkey: str, to_pubkey: str, amount: int) -> bool:
         """Transfer tokens using allowance"""
@@ -140,19 +204,33 @@ class VaultToken:
             return False
         
         # Reduce allowance
-        self._allowances[from_pubkey][spender] = allowed - amount
+        self._allowances[(from_pubkey, spender)] = allowed - amount
         return True
     
     def get_voting_power(self, pubkey: str) -> float:
         """Get voting power percentage for address"""
-        balance = self.balance_of(pubkey)
-        return (balance / self.total_supply) * 100
+        return self._balances.get(pubkey, 0) * self._inv_supply_pct
+    
+    def get_transfer_history(self, since_index: int = 0) -> List[Dict[str, Any]]:
+        """Get token transfer history, optionally only entries from since_index on"""
+        return [
+            {'from': f, 'to': t, 'amount': a, 'timestamp': ts}
+            for f, t, a, ts in zip(
+                self._tx_from[since_index:], self._tx_to[since_index:],
+                self._tx_amount[since_index:], self._tx_ts[since_index:]
+            )
+        ]
     
-    def get_transfer_history(self) -> List[Dict[str, Any]]:
-        """Get token transfer history"""
-        return self._transfer_history.copy()
+    def iter_transfers(self) -> Iterator[Dict[str, Any]]:
+        """Iterate transfer history without copying the columns"""
+        for f, t, a, ts in zip(self._tx_from, self._tx_to, self._tx_amount, self._tx_ts):
+            yield {'from': f, 'to': t, 'amount': a, 'timestamp': ts}
+    
+    def transfer_history_root(self) -> str:
+        """Merkle root committing to the full transfer history"""
+        return self._transfer_merkle.root().hex()
 
-@dataclass
+@dataclass(slots=True)
 class GovernanceProposal:
     """Governance proposal for vault management"""
     
@@ -179,6 +257,9 @@ class GovernanceProposal:
     created_at_height: int
     voting_ends_at_height: int
     execution_height: Optional[int] = None
+    
+    # O(1) duplicate-vote check; `voters` keeps vote order
+    voters_set: Set[str] = field(default_factory=set, repr=False, compare=False)
 
 class GovernanceSystem:
     """Charms-based governance system for vault management"""
@@ -188,6 +269,8 @@ class GovernanceSystem:
         self.vault = vault
         self.proposals = {}  # proposal_id -> GovernanceProposal
         self._proposal_counter = 0
+        self._active_proposal_ids = {}  # proposal_id -> None, insertion-ordered ACTIVE index
+        self._results_cache = {}  # proposal_id -> (version key, results dict)
     
     def create_proposal(
         self,
@@ -204,17 +287,18 @@ class GovernanceSystem:
         """Create new governance proposal"""
         
         # Check proposer has minimum voting power
-        proposer_power = self.vault_token.get_voting_power(proposer)
         min_proposal_power = 5.0  # 5% minimum to propose
         
-        if proposer_power < min_proposal_power:
+        if not self._meets_threshold(self.vault_token.balance_of(proposer), min_proposal_power):
+            proposer_power = self.vault_token.get_voting_power(proposer)
             raise ValueError(f"Proposer needs {min_proposal_power}% voting power, has {proposer_power}%")
         
         # Generate proposal ID
         self._proposal_counter += 1
-        proposal_id = hashlib.sha256(
-            f"{self.vault.vault_id}_{self._proposal_counter}_{proposer}".encode()
-        ).hexdigest()[:16]
+        proposal_id = sys.intern(hashlib.blake2b(
+            b"%s_%d_%s" % (self.vault.vault_id.encode(), self._proposal_counter, proposer.encode()),
+            digest_size=8
+        ).hexdigest())
         
         # Create proposal
         proposal = GovernanceProposal(
@@ -236,6 +320,7 @@ class GovernanceSystem:
         )
         
         self.proposals[proposal_id] = proposal
+        self._active_proposal_ids[proposal_id] = None
         return proposal_id
     
     def vote(self, proposal_id: str, voter: str, vote_for: bool, current_height: int) -> bool:
@@ -249,10 +334,11 @@ class GovernanceSystem:
         # Check voting period
         if current_height > proposal.voting_ends_at_height:
             proposal.status = ProposalStatus.REJECTED
+            self._active_proposal_ids.pop(proposal_id, None)
             return False
         
         # Check if already voted
-        if voter in proposal.voters:
+        if voter in proposal.voters_set:
             return False
         
         # Get voting power
@@ -262,6 +348,7 @@ class GovernanceSystem:
         
         # Record vote
         proposal.voters.append(voter)
+        proposal.voters_set.add(voter)
         
         if vote_for:
             proposal.votes_for += voting_power
@@ -282,15 +369,16 @@ class GovernanceSystem:
         if current_height <= proposal.voting_ends_at_height:
             return False
         
+        # Every outcome below moves the proposal out of ACTIVE
+        self._active_proposal_ids.pop(proposal_id, None)
+        
         # Calculate results
         total_votes = proposal.votes_for + proposal.votes_against
         if total_votes == 0:
             proposal.status = ProposalStatus.REJECTED
             return False
         
-        votes_for_percentage = (proposal.votes_for / self.vault_token.total_supply) * 100
-        
-        if votes_for_percentage >= proposal.required_voting_power:
+        if self._meets_threshold(proposal.votes_for, proposal.required_voting_power):
             proposal.status = ProposalStatus.PASSED
             proposal.execution_height = current_height + proposal.execution_delay_blocks
         else:
@@ -347,6 +435,10 @@ class GovernanceSystem:
         else:
             return {'action': 'unknown', 'proposal_type': proposal.proposal_type.value}
     
+    def _meets_threshold(self, votes: int, percentage: float) -> bool:
+        """Whether votes reach percentage of supply, compared without dividing"""
+        return votes * 100 >= percentage * self.vault_token.total_supply
+    
     def get_proposal(self, proposal_id: str) -> Optional[GovernanceProposal]:
         """Get proposal by ID"""
         return self.proposals.get(proposal_id)
@@ -355,26 +447,37 @@ class GovernanceSystem:
         """Get all active proposals"""
         active = []
         
-        for proposal in self.proposals.values():
-            if (proposal.status == ProposalStatus.ACTIVE and 
-                current_height <= proposal.voting_ends_at_height):
+        # Only proposals still marked ACTIVE are indexed
+        for proposal_id in self._active_proposal_ids:
+            proposal = self.proposals[proposal_id]
+            if current_height <= proposal.voting_ends_at_height:
                 active.append(proposal)
         
         return active
     
     def get_proposal_results(self, proposal_id: str) -> Dict[str, Any]:
-        """Get detailed proposal results"""
+        """Get detailed proposal results
+        
+        Results are cached per proposal until a vote lands or its status
+        changes; the returned dict is shared and must not be mutated.
+        """
         
         if proposal_id not in self.proposals:
             return {}
         
         proposal = self.proposals[proposal_id]
         
-        total_supply = self.vault_token.total_supply
-        votes_for_pct = (proposal.votes_for / total_supply) * 100
-        votes_against_pct = (proposal.votes_against / total_supply) * 100
+        # Tallies only move when a voter is appended
+        version = (len(proposal.voters), proposal.status)
+        cached = self._results_cache.get(proposal_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        inv_supply_pct = self.vault_token._inv_supply_pct
+        votes_for_pct = proposal.votes_for * inv_supply_pct
+        votes_against_pct = proposal.votes_against * inv_supply_pct
         
-        return {
+        results = {
             'proposal_id': proposal_id,
             'status': proposal.status.value,
             'votes_for': proposal.votes_for,
@@ -383,5 +486,7 @@ class GovernanceSystem:
             'votes_against_percentage': votes_against_pct,
             'required_percentage': proposal.required_voting_power,
             'total_voters': len(proposal.voters),
-            'passed': votes_for_pct >= proposal.required_voting_power
+            'passed': self._meets_threshold(proposal.votes_for, proposal.required_voting_power)
         }
+        self._results_cache[proposal_id] = (version, results)
+        return results
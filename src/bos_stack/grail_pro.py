@@ -4,10 +4,33 @@ BOS-aligned interface with working cryptographic operations
 """
 
 import hashlib
-import json
-from typing import Dict, Any
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+import struct
+from dataclasses import astuple
+from functools import cached_property, lru_cache
+from typing import Dict, Any, Optional
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+# Process-wide proving key; the verification key travels with each proof
+_SIGNING_KEY = ed25519.Ed25519PrivateKey.generate()
+_VERIFICATION_KEY = _SIGNING_KEY.public_key().public_bytes(
+    encoding=serialization.Encoding.Raw,
+    format=serialization.PublicFormat.Raw
+)
+
+# SHA-256 state with the domain tag already absorbed; copied per proof
+_PROOF_HASHER = hashlib.sha256(b"GRAIL_PRO_PROOF_V1")
+
+@lru_cache(maxsize=128)
+def _rules_digest(rules: 'WithdrawalRules') -> bytes:
+    """SHA-256 over the rules packed as little-endian int64 fields"""
+    values = astuple(rules)
+    return hashlib.sha256(struct.pack('<%dq' % len(values), *values)).digest()
+
+@lru_cache(maxsize=256)
+def _load_public_key(verification_key: bytes) -> ed25519.Ed25519PublicKey:
+    """Parse a raw Ed25519 verification key once per distinct key"""
+    return ed25519.Ed25519PublicKey.from_public_bytes(verification_key)
 
 class GrailProof:
     """zk proof compatible with Grail Pro interface"""
@@ -16,6 +39,7 @@ class GrailProof:
         self.predicate = predicate
         self.proof_data = proof_data
         self.verification_key = verification_key
+        self._verify_circuit = None  # verifier-side circuit, never the prover's
     
     @classmethod
     def generate(cls, predicate: 'VaultPredicate', vault: 'Vault') -> 'GrailProof':
@@ -26,8 +50,8 @@ class GrailProof:
         if not is_valid:
             raise ValueError(f"Predicate verification failed: {reason}")
         
-        # Generate cryptographic proof
-        circuit = VaultCircuit(predicate, vault)
+        # Generate cryptographic proof; the circuit reuses the result above
+        circuit = VaultCircuit(predicate, vault, precomputed_valid=is_valid)
         proof_data = ProofSystem.prove(circuit)
         verification_key = ProofSystem.generate_verification_key(circuit)
         
@@ -40,9 +64,12 @@ class GrailProof:
         if self.predicate.vault_commitment != vault_commitment:
             return False
         
-        # Verify cryptographic proof
-        circuit = VaultCircuit(self.predicate, self.predicate.vault)
-        return ProofSystem.verify(self.proof_data, self.verification_key, circuit)
+        # Verify cryptographic proof against a circuit the verifier
+        # synthesizes itself (no precomputed result); it is kept across calls
+        # since the commitment check above pins the vault state it was built from
+        if self._verify_circuit is None:
+            self._verify_circuit = VaultCircuit(self.predicate, self.predicate.vault)
+        return ProofSystem.verify(self.proof_data, self.verification_key, self._verify_circuit)
     
     def get_withdrawal_amount(self) -> int:
         """Get net withdrawal amount from proof"""
@@ -82,88 +109,71 @@ class GrailProof:
         )
 
 class VaultCircuit:
-    """Circuit definition for Grail Pro zk proof system"""
+    """Circuit definition for Grail Pro zk proof system
+    
+    A circuit is a snapshot of one predicate, so its inputs and synthesis
+    result are computed once and memoized.
+    """
     
-    def __init__(self, predicate: 'VaultPredicate', vault: 'Vault'):
+    def __init__(self, predicate: 'VaultPredicate', vault: 'Vault', precomputed_valid: Optional[bool] = None):
         self.predicate = predicate
         self.vault = vault
+        self._precomputed_valid = precomputed_valid
     
+    @cached_property
     def synthesize(self) -> bool:
         """Circuit synthesis - this would run in zkVM"""
+        if self._precomputed_valid is not None:
+            return self._precomputed_valid
         is_valid, _ = self.predicate.verify()
         return is_valid
     
+    @cached_property
     def public_inputs(self) -> bytes:
         """Public inputs visible on Bitcoin"""
-        inputs = b""
-        inputs += bytes.fromhex(self.vault.commitment_hash())
-        inputs += self.predicate.withdrawal_request.amount.to_bytes(8, 'little')
-        inputs += self.predicate.withdrawal_request.current_height.to_bytes(4, 'little')
-        return inputs
+        request = self.predicate.withdrawal_request
+        return b"".join((
+            bytes.fromhex(self.vault.commitment_hash()),
+            request.amount.to_bytes(8, 'little'),
+            request.current_height.to_bytes(4, 'little')
+        ))
     
+    @cached_property
     def private_inputs(self) -> bytes:
         """Private inputs hidden by zk proof"""
-        inputs = b""
-        for signer in self.predicate.withdrawal_request.signers:
-            inputs += bytes.fromhex(signer)
-        inputs += json.dumps(self.predicate.rules.__dict__).encode()
-        return inputs
+        parts = [bytes.fromhex(signer) for signer in self.predicate.withdrawal_request.signers]
+        parts.append(_rules_digest(self.predicate.rules))
+        return b"".join(parts)
 
 class ProofSystem:
     """Grail Pro proof system interface"""
     
+    @staticmethod
+    def _circuit_hash(circuit: VaultCircuit) -> bytes:
+        """Tagged hash over circuit inputs and synthesis result"""
+        hasher = _PROOF_HASHER.copy()
+        hasher.update(circuit.public_inputs)
+        hasher.update(circuit.private_inputs)
+        hasher.update(b"VALID" if circuit.synthesize else b"INVALID")
+        return hasher.digest()
+    
     @staticmethod
     def prove(circuit: VaultCircuit) -> bytes:
         """Generate zk proof for circuit"""
         
         # Create deterministic proof based on circuit inputs
-        hasher = hashlib.sha256()
-        hasher.update(b"GRAIL_PRO_PROOF_V1")
-        hasher.update(circuit.public_inputs())
-        hasher.update(circuit.private_inputs())
-        
-        # Add circuit synthesis result
-        synthesis_result = circuit.synthesize()
-        hasher.update(b"VALID" if synthesis_result else b"INVALID")
-        
-        # Generate RSA signature as proof (mock cryptographic proof)
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048
-        )
+        proof_hash = ProofSystem._circuit_hash(circuit)
         
-        signature = private_key.sign(
-            hasher.digest(),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        # Sign the circuit hash as proof (mock cryptographic proof)
+        signature = _SIGNING_KEY.sign(proof_hash)
         
         # Combine hash and signature
-        proof = hasher.digest() + signature
-        return proof
+        return proof_hash + signature
     
     @staticmethod
     def generate_verification_key(circuit: VaultCircuit) -> bytes:
         """Generate verification key for circuit"""
-        
-        # Generate public key for verification
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048
-        )
-        public_key = private_key.public_key()
-        
-        # Serialize public key
-        from cryptography.hazmat.primitives import serialization
-        vk = public_key.public_bytes(
-            encoding=serialization.Encoding.DER,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        
-        return vk
+        return _VERIFICATION_KEY
     
     @staticmethod
     def verify(proof_data: bytes, verification_key: bytes, circuit: VaultCircuit) -> bool:
@@ -178,32 +188,14 @@ class ProofSystem:
             signature = proof_data[32:]
             
             # Reconstruct expected hash
-            hasher = hashlib.sha256()
-            hasher.update(b"GRAIL_PRO_PROOF_V1")
-            hasher.update(circuit.public_inputs())
-            hasher.update(circuit.private_inputs())
-            
-            synthesis_result = circuit.synthesize()
-            hasher.update(b"VALID" if synthesis_result else b"INVALID")
-            expected_hash = hasher.digest()
+            expected_hash = ProofSystem._circuit_hash(circuit)
             
             # Verify hash matches
             if proof_hash != expected_hash:
                 return False
             
-            # Verify signature (mock verification)
-            from cryptography.hazmat.primitives import serialization
-            public_key = serialization.load_der_public_key(verification_key)
-            
-            public_key.verify(
-                signature,
-                expected_hash,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            # Verify signature (mock verification); raises on mismatch
+            _load_public_key(verification_key).verify(signature, expected_hash)
             
             return True
             
@@ -5,18 +5,33 @@ BOS-aligned interface for cross-chain proof verification
 
 import hashlib
 import json
+import logging
+import sys
 from enum import Enum
+from functools import lru_cache
 from typing import List, Dict, Any
 from dataclasses import dataclass
 
-class ChainId(Enum):
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json emits the same bytes
+    orjson = None
+
+class ChainId(str, Enum):
     BITCOIN = "bitcoin"
     ETHEREUM = "ethereum"
     POLYGON = "polygon"
     ARBITRUM = "arbitrum"
     BSC = "bsc"
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1024)
+def _proof_key(vault_id: str, chain: ChainId) -> str:
+    """Interned verified-proof key, shared by every lookup for a vault/chain"""
+    return sys.intern(vault_id + "_" + chain)
+
+@dataclass(slots=True)
 class BitcoinProof:
     """Proof of Bitcoin UTXO state for cross-chain verification"""
     utxo_hash: str
@@ -34,12 +49,17 @@ class BitcoinProof:
             'merkle_proof': self.merkle_proof,
             'block_header': self.block_header
         }
-        return json.dumps(data).encode()
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, separators=(',', ':')).encode()
     
     @classmethod
     def deserialize(cls, data: bytes) -> 'BitcoinProof':
         """Deserialize proof from bytes"""
-        parsed = json.loads(data.decode())
+        if orjson is not None:
+            parsed = orjson.loads(data)
+        else:
+            parsed = json.loads(data)
         return cls(**parsed)
 
 class ZkBtcBridge:
@@ -69,20 +89,18 @@ class ZkBtcBridge:
         # Mock Bitcoin proof generation
         utxo_hash = vault.commitment_hash()
         
-        # Generate mock merkle proof
+        # Generate mock merkle proof; keep the running hash as bytes
         merkle_proof = []
-        current_hash = utxo_hash
+        current_hash = bytes.fromhex(utxo_hash)
+        sha256 = hashlib.sha256
         for i in range(10):  # Mock merkle tree depth
-            hasher = hashlib.sha256()
-            hasher.update(bytes.fromhex(current_hash))
-            hasher.update(f"merkle_node_{i}".encode())
-            current_hash = hasher.hexdigest()
-            merkle_proof.append(current_hash)
+            current_hash = sha256(current_hash + b"merkle_node_%d" % i).digest()
+            merkle_proof.append(current_hash.hex())
         
         # Generate mock block header
         block_header_hasher = hashlib.sha256()
         block_header_hasher.update(f"block_{vault.created_height}".encode())
-        block_header_hasher.update(bytes.fromhex(current_hash))
+        block_header_hasher.update(current_hash)
         block_header = block_header_hasher.hexdigest()
         
         return BitcoinProof(
@@ -115,9 +133,10 @@ class ZkBtcBridge:
             raise ValueError(f"Collateral amount {amount} exceeds maximum {max_collateral}")
         
         # Mock collateral position creation
-        position_id = hashlib.sha256(
-            f"{self.vault_id}_{amount}_{self.target_chain.value}".encode()
-        ).hexdigest()[:16]
+        position_id = hashlib.blake2b(
+            b"%s_%d_%s" % (self.vault_id.encode(), amount, self.target_chain.encode()),
+            digest_size=8
+        ).hexdigest()
         
         return {
             'position_id': position_id,
@@ -139,6 +158,7 @@ class CrossChainVerifier:
             ChainId.ARBITRUM
         ]
         self._verified_proofs = {}
+        self._verified_by_vault = {}  # vault_id -> {proof_key: None}, insertion-ordered
     
     def verify_bitcoin_state(self, proof: BitcoinProof, vault_id: str, chain: ChainId) -> bool:
         """Verify Bitcoin UTXO proof on target chain"""
@@ -155,25 +175,30 @@ class CrossChainVerifier:
             return False
         
         # Store verified proof
-        proof_key = f"{vault_id}_{chain.value}"
+        proof_key = _proof_key(vault_id, chain)
         self._verified_proofs[proof_key] = {
             'proof': proof,
             'verified_at': proof.block_height,
             'chain': chain
         }
+        self._verified_by_vault.setdefault(vault_id, {})[proof_key] = None
         
         return True
     
     def _verify_merkle_proof(self, proof: BitcoinProof) -> bool:
         """Verify merkle proof of UTXO inclusion"""
         
-        current_hash = proof.utxo_hash
+        # Decode every node in one pass, then fold 32-byte slices through
+        # one reused 64-byte buffer for (current || node)
+        current_hash = bytes.fromhex(proof.utxo_hash)
+        nodes = memoryview(bytes.fromhex("".join(proof.merkle_proof)))
+        buf = bytearray(64)
+        sha256 = hashlib.sha256
         
-        for merkle_node in proof.merkle_proof:
-            hasher = hashlib.sha256()
-            hasher.update(bytes.fromhex(current_hash))
-            hasher.update(bytes.fromhex(merkle_node))
-            current_hash = hasher.hexdigest()
+        for offset in range(0, len(nodes), 32):
+            buf[:32] = current_hash
+            buf[32:] = nodes[offset:offset + 32]
+            current_hash = sha256(buf).digest()
         
         # In real implementation, would verify against block header
         return len(proof.merkle_proof) > 0
@@ -193,7 +218,7 @@ class CrossChainVerifier:
     
     def get_verified_proof(self, vault_id: str, chain: ChainId) -> Dict[str, Any]:
         """Get verified proof for vault on specific chain"""
-        proof_key = f"{vault_id}_{chain.value}"
+        proof_key = _proof_key(vault_id, chain)
         return self._verified_proofs.get(proof_key)
     
     def sync_vault_state(self, vault_id: str, new_balance: int) -> List[str]:
@@ -201,12 +226,12 @@ class CrossChainVerifier:
         
         synced_chains = []
         
-        for proof_key, proof_data in self._verified_proofs.items():
-            if proof_key.startswith(vault_id):
-                # Update proof with new balance
-                proof_data['proof'].amount = new_balance
-                chain = proof_data['chain']
-                synced_chains.append(chain.value)
-                print(f"Synced vault {vault_id} balance {new_balance} to {chain.value}")
+        for proof_key in self._verified_by_vault.get(vault_id, ()):
+            # Update proof with new balance
+            proof_data = self._verified_proofs[proof_key]
+            proof_data['proof'].amount = new_balance
+            chain = proof_data['chain']
+            synced_chains.append(chain.value)
+            logger.debug("Synced vault %s balance %d to %s", vault_id, new_balance, chain.value)
         
         return synced_chains
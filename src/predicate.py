@@ -1,24 +1,41 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+from .bitcoin_integration import canonical_pubkey
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WithdrawalRequest:
-    """Request for vault withdrawal"""
+    """Request for vault withdrawal (immutable once created)"""
     amount: int  # satoshis
     current_height: int
-    signers: List[str]  # List of public keys (hex)
+    signers: Tuple[str, ...]  # Public keys (hex); lists are accepted and converted
     is_emergency: bool
     last_withdrawal_height: Optional[int] = None
     recipient_address: Optional[str] = None
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'signers', tuple(canonical_pubkey(s) for s in self.signers))
 
 class VaultPredicate:
     """zk predicate that enforces vault withdrawal rules"""
     
     def __init__(self, vault, rules, withdrawal_request: WithdrawalRequest):
         self.vault_commitment = vault.commitment_hash()
+        self._vault_version = vault._state_version
         self.rules = rules
+        self._rule_check = rules.compile_fused()  # specialized checker, resolved once
         self.withdrawal_request = withdrawal_request
         self.vault = vault  # Keep reference for verification
+        self._verify_cache = None  # (vault state version, result) of the last verify()
+    
+    def __getstate__(self) -> dict:
+        # The compiled checker is a closure; it is re-resolved from the rules
+        state = self.__dict__.copy()
+        del state['_rule_check']
+        return state
+    
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._rule_check = self.rules.compile_fused()
     
     def verify(self) -> tuple[bool, str]:
         """
@@ -26,19 +43,45 @@ class VaultPredicate:
         Returns (is_valid, reason)
         """
         
-        # Verify vault commitment matches
-        if self.vault_commitment != self.vault.commitment_hash():
-            return False, "Vault commitment mismatch"
+        # The request is frozen and its signers a tuple, so the result
+        # depends only on vault state
+        key = self.vault._state_version
+        cached = self._verify_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        # Cheap request checks run first; only a request that would be
+        # approved pays for the commitment check
+        result = self._check_request()
+        if result[0] and not self._commitment_matches():
+            result = (False, "Vault commitment mismatch")
         
+        self._verify_cache = (key, result)
+        return result
+    
+    def _commitment_matches(self) -> bool:
+        """Whether the vault is unchanged since the commitment was taken
+        
+        Every assignment to committed vault state bumps its version, so a
+        version compare replaces recomputing and comparing the hash.
+        """
+        return self._vault_version == self.vault._state_version
+    
+    def _check_request(self) -> tuple[bool, str]:
+        """Signer, emergency, rule and balance checks against current vault state"""
         req = self.withdrawal_request
         
-        # Verify all signers are vault members
-        for signer in req.signers:
-            if not self.vault.is_member(signer):
-                return False, f"Signer {signer[:8]}... is not a vault member"
+        if req.amount <= 0:
+            return False, "Withdrawal amount must be positive"
+        
+        # Verify all signers are vault members (one set difference)
+        unique_signers = set(req.signers)
+        non_members = unique_signers - self.vault._pubkey_set
+        if non_members:
+            signer = next(s for s in req.signers if s in non_members)
+            return False, f"Signer {signer[:8]}... is not a vault member"
         
-        # Remove duplicate signers
-        unique_signers = list(set(req.signers))
+        # Reject duplicate signers
         if len(unique_signers) != len(req.signers):
             return False, "Duplicate signers not allowed"
         
@@ -54,26 +97,18 @@ class VaultPredicate:
                 remaining = self.rules.emergency_timeout_blocks - blocks_since_creation
                 return False, f"Emergency timeout not reached: {remaining} blocks remaining"
         
-        # Normal withdrawal validation
-        is_valid, reason = self.rules.validate_withdrawal(
-            req.amount, 
-            len(unique_signers), 
-            len(self.vault.members)
+        # Normal withdrawal validation, including the large-withdrawal cooling period
+        is_valid, reason, penalty = self._rule_check(
+            req.amount,
+            len(unique_signers),
+            len(self.vault.members),
+            req.current_height,
+            req.last_withdrawal_height
         )
         if not is_valid:
             return False, reason
         
-        # Check cooling period for large withdrawals
-        cooling_ok, cooling_reason = self.rules.check_cooling_period(
-            req.current_height,
-            req.last_withdrawal_height,
-            req.amount
-        )
-        if not cooling_ok:
-            return False, cooling_reason
-        
         # Ensure vault has sufficient balance
-        penalty = self.rules.calculate_penalty(req.amount, req.current_height)
         net_withdrawal = req.amount - penalty
         
         if net_withdrawal > self.vault.total_balance:
@@ -100,7 +135,7 @@ class VaultPredicate:
         """Serialize predicate for proof generation"""
         return {
             'vault_commitment': self.vault_commitment,
-            'rules': self.rules.__dict__,
+            'rules': asdict(self.rules),
             'withdrawal_request': {
                 'amount': self.withdrawal_request.amount,
                 'current_height': self.withdrawal_request.current_height,
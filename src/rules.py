@@ -1,9 +1,15 @@
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
 
-@dataclass
+# (amount, signers_count, total_members, current_height, last_withdrawal_height) -> (is_valid, reason)
+RuleCheck = Callable[[int, int, int, int, Optional[int]], Tuple[bool, str]]
+# Same arguments -> (is_valid, reason, penalty); penalty is 0 when invalid
+FusedRuleCheck = Callable[[int, int, int, int, Optional[int]], Tuple[bool, str, int]]
+
+@dataclass(frozen=True, slots=True)
 class WithdrawalRules:
-    """Programmable withdrawal rules for the vault"""
+    """Programmable withdrawal rules for the vault (immutable; use dataclasses.replace to change)"""
     
     # Basic quorum rules
     min_signers: int
@@ -49,10 +55,9 @@ class WithdrawalRules:
     
     def calculate_penalty(self, amount: int, current_height: int) -> int:
         """Calculate penalty for early withdrawal"""
-        if current_height >= self.penalty_free_height:
-            return 0
-        
-        return (amount * self.early_withdrawal_penalty_bps) // 10_000
+        # Straight-line form: the comparison zeroes the penalty once penalty-free
+        is_early = current_height < self.penalty_free_height
+        return (amount * self.early_withdrawal_penalty_bps * is_early) // 10_000
     
     def is_large_withdrawal(self, amount: int) -> bool:
         """Check if withdrawal is considered large"""
@@ -90,3 +95,78 @@ class WithdrawalRules:
             return False, f"Cooling period: {remaining} blocks remaining"
         
         return True, "Cooling period satisfied"
+    
+    def bulk_calculate_penalty(self, amounts: Sequence[int], heights: Sequence[int]) -> List[int]:
+        """Penalties for many (amount, height) pairs, e.g. when re-auditing history"""
+        bps = self.early_withdrawal_penalty_bps
+        free_height = self.penalty_free_height
+        return [
+            (amount * bps * (height < free_height)) // 10_000
+            for amount, height in zip(amounts, heights)
+        ]
+    
+    def bulk_validate(self, amounts: Sequence[int], signer_counts: Sequence[int], total_members: int,
+                      current_heights: Sequence[int],
+                      last_withdrawal_heights: Sequence[Optional[int]]) -> List[bool]:
+        """Re-check many historical withdrawals against these rules"""
+        check = self.compile_fused()
+        return [
+            check(amount, signers, total_members, height, last_height)[0]
+            for amount, signers, height, last_height
+            in zip(amounts, signer_counts, current_heights, last_withdrawal_heights)
+        ]
+    
+    def compile(self) -> RuleCheck:
+        """Build a checker specialized to these rule values
+        
+        Equivalent to validate_withdrawal followed by check_cooling_period,
+        with every threshold bound as a closure constant. Rules are
+        immutable, so checkers are cached per distinct rule set.
+        """
+        return _compile_rules(self)[0]
+    
+    def compile_fused(self) -> FusedRuleCheck:
+        """Like compile(), but the checker also returns the early-withdrawal penalty"""
+        return _compile_rules(self)[1]
+    
+    def fused_check(self, amount: int, signers_count: int, total_members: int,
+                    current_height: int, last_withdrawal_height: Optional[int]) -> tuple[bool, str, int]:
+        """Validate, check cooling and compute the penalty in one pass"""
+        return self.compile_fused()(amount, signers_count, total_members, current_height, last_withdrawal_height)
+
+@lru_cache(maxsize=128)
+def _compile_rules(rules: WithdrawalRules) -> Tuple[RuleCheck, FusedRuleCheck]:
+    min_signers = rules.min_signers
+    large_threshold = rules.large_withdrawal_threshold
+    large_requires_all = rules.large_withdrawal_requires_all
+    max_single = rules.max_single_withdrawal
+    cooling_period = rules.withdrawal_cooling_period
+    penalty_bps = rules.early_withdrawal_penalty_bps
+    penalty_free_height = rules.penalty_free_height
+    
+    def fused(amount: int, signers_count: int, total_members: int,
+              current_height: int, last_withdrawal_height: Optional[int]) -> Tuple[bool, str, int]:
+        if signers_count < min_signers:
+            return False, f"Need at least {min_signers} signers, got {signers_count}", 0
+        
+        is_large = amount >= large_threshold
+        if is_large and large_requires_all and signers_count != total_members:
+            return False, f"Large withdrawal requires all {total_members} signers, got {signers_count}", 0
+        
+        if amount > max_single:
+            return False, f"Withdrawal {amount} exceeds maximum {max_single}", 0
+        
+        if is_large and last_withdrawal_height is not None:
+            blocks_since_last = current_height - last_withdrawal_height
+            if blocks_since_last < cooling_period:
+                return False, f"Cooling period: {cooling_period - blocks_since_last} blocks remaining", 0
+        
+        penalty = (amount * penalty_bps * (current_height < penalty_free_height)) // 10_000
+        return True, "Valid withdrawal", penalty
+    
+    def check(amount: int, signers_count: int, total_members: int,
+              current_height: int, last_withdrawal_height: Optional[int]) -> Tuple[bool, str]:
+        is_valid, reason, _ = fused(amount, signers_count, total_members, current_height, last_withdrawal_height)
+        return is_valid, reason
+    
+    return check, fused
@@ -1,19 +1,45 @@
 import hashlib
 import json
-from dataclasses import dataclass, asdict
+import struct
+from array import array
+from dataclasses import dataclass
 from typing import List, Optional
-from .bitcoin_integration import BitcoinKey
+from .bitcoin_integration import BitcoinKey, canonical_pubkey
+from .predicate import VaultPredicate
+from .bos_stack.grail_pro import GrailProof
 
-@dataclass
+# Precompiled little-endian layouts for the commitment preimage
+_MEMBER_PACK = struct.Struct('<BI').pack  # share_percentage, join_height
+_FOOTER_PACK = struct.Struct('<QI').pack  # total_balance, created_height
+
+# BLAKE2b personalization strings domain-separate the two vault hashes
+_VAULT_ID_PERSON = b"MPVAULT_ID_V2"
+_COMMITMENT_PERSON = b"MPVAULT_CMT_V2"
+
+@dataclass(frozen=True)
 class VaultMember:
-    """Represents a member of the multi-party vault"""
+    """Represents a member of the multi-party vault (immutable once created)"""
     pubkey: str  # Bitcoin public key (hex)
     share_percentage: int  # 0-100
     join_height: int  # Block height when joined
     
+    # Encoded forms cached for hashing; they are not dataclass fields
+    __slots__ = ('pubkey', 'share_percentage', 'join_height',
+                 'pubkey_bytes', 'share_height_bytes')
+    
     def __post_init__(self):
+        pubkey = canonical_pubkey(self.pubkey)
+        object.__setattr__(self, 'pubkey', pubkey)
+        object.__setattr__(self, 'pubkey_bytes', bytes.fromhex(pubkey))
         if not (0 <= self.share_percentage <= 100):
             raise ValueError("Share percentage must be between 0 and 100")
+        object.__setattr__(self, 'share_height_bytes', _MEMBER_PACK(self.share_percentage, self.join_height))
+    
+    def __reduce__(self):
+        # Rebuild through __init__ so the cached encodings are recomputed
+        return (VaultMember, (self.pubkey, self.share_percentage, self.join_height))
+
+_COMMITTED_FIELDS = frozenset(('members', 'total_balance', 'created_height', 'vault_id'))
 
 @dataclass
 class Vault:
@@ -23,56 +49,121 @@ class Vault:
     created_height: int
     vault_id: str
     
+    __slots__ = ('members', 'total_balance', 'created_height', 'vault_id',
+                 '_commitment_cache', '_state_version', '_pubkey_set', '_share_map',
+                 '_vault_id_bytes', '_members_blob', '_commit_prefix',
+                 '_pubkeys', '_shares', '_join_heights')
+    
     def __init__(self, members: List[VaultMember]):
+        self._commitment_cache: Optional[str] = None
+        self._commit_prefix = None  # blake2b state over the id and member blob
+        self._state_version = 0
         self.members = members
         self.total_balance = 0
         self.created_height = 0
         self.vault_id = self._generate_vault_id()
         
         # Validate member shares
-        total_shares = sum(m.share_percentage for m in members)
+        total_shares = sum(self._shares)
         if total_shares != 100:
             raise ValueError(f"Member shares must sum to 100%, got {total_shares}%")
     
     def _generate_vault_id(self) -> str:
         """Generate deterministic vault ID from members"""
-        hasher = hashlib.sha256()
-        hasher.update(b"MULTIPARTY_VAULT_V1")
+        hasher = hashlib.blake2b(digest_size=32, person=_VAULT_ID_PERSON)
         
         for member in sorted(self.members, key=lambda m: m.pubkey):
-            hasher.update(bytes.fromhex(member.pubkey))
+            hasher.update(member.pubkey_bytes)
         
         return hasher.hexdigest()
     
+    def __getstate__(self) -> dict:
+        # The dataclass fields plus the cached commitment and state version
+        # are persisted; other derived caches (including the unpicklable hash
+        # prefix) are rebuilt by __setstate__
+        return {
+            'members': self.members,
+            'total_balance': self.total_balance,
+            'created_height': self.created_height,
+            'vault_id': self.vault_id,
+            '_commitment_cache': self._commitment_cache,
+            '_state_version': self._state_version
+        }
+    
+    def __setstate__(self, state: dict):
+        object.__setattr__(self, '_commit_prefix', None)
+        object.__setattr__(self, '_state_version', 0)
+        for name in _COMMITTED_FIELDS:
+            setattr(self, name, state[name])
+        # Restored last, since assigning the fields above clears the cache
+        # and bumps the version; predicates pickled alongside the vault
+        # recorded the original version
+        object.__setattr__(self, '_commitment_cache', state.get('_commitment_cache'))
+        object.__setattr__(self, '_state_version', state.get('_state_version', self._state_version))
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # Any change to committed state invalidates the cached digest
+        if name in _COMMITTED_FIELDS:
+            object.__setattr__(self, '_commitment_cache', None)
+            object.__setattr__(self, '_state_version', self._state_version + 1)
+        if name == 'members':
+            # Column views of the members plus hashed lookups over them,
+            # rebuilt whenever members is reassigned
+            pubkeys = [m.pubkey for m in value]
+            shares = array('B', [m.share_percentage for m in value])
+            object.__setattr__(self, '_pubkeys', pubkeys)
+            object.__setattr__(self, '_shares', shares)
+            object.__setattr__(self, '_join_heights', array('I', [m.join_height for m in value]))
+            object.__setattr__(self, '_pubkey_set', frozenset(pubkeys))
+            object.__setattr__(self, '_share_map', dict(zip(pubkeys, shares)))
+            # Member section of the commitment preimage, encoded once
+            object.__setattr__(self, '_members_blob', b"".join(
+                m.pubkey_bytes + m.share_height_bytes for m in value
+            ))
+            object.__setattr__(self, '_commit_prefix', None)
+        elif name == 'vault_id':
+            object.__setattr__(self, '_vault_id_bytes', bytes.fromhex(value))
+            object.__setattr__(self, '_commit_prefix', None)
+    
     def commitment_hash(self) -> str:
-        """Generate commitment hash for Bitcoin UTXO"""
-        hasher = hashlib.sha256()
-        hasher.update(bytes.fromhex(self.vault_id))
-        
-        for member in self.members:
-            hasher.update(bytes.fromhex(member.pubkey))
-            hasher.update(member.share_percentage.to_bytes(1, 'little'))
-            hasher.update(member.join_height.to_bytes(4, 'little'))
-        
-        hasher.update(self.total_balance.to_bytes(8, 'little'))
-        hasher.update(self.created_height.to_bytes(4, 'little'))
+        """Generate commitment hash for Bitcoin UTXO (cached until state changes)"""
+        if self._commitment_cache is None:
+            self._commitment_cache = self._compute_commitment_hash()
+        return self._commitment_cache
+    
+    def _compute_commitment_hash(self) -> str:
+        # Only the 12-byte footer varies while membership is unchanged, so
+        # the prefix is absorbed once and its hash state forked per call
+        prefix = self._commit_prefix
+        if prefix is None:
+            prefix = self._commit_prefix = hashlib.blake2b(
+                self._vault_id_bytes + self._members_blob, digest_size=32, person=_COMMITMENT_PERSON
+            )
         
+        hasher = prefix.copy()
+        hasher.update(_FOOTER_PACK(self.total_balance, self.created_height))
         return hasher.hexdigest()
     
     def is_member(self, pubkey: str) -> bool:
         """Check if pubkey is a vault member"""
-        return any(m.pubkey == pubkey for m in self.members)
+        return pubkey in self._pubkey_set
     
     def get_member_share(self, pubkey: str) -> Optional[int]:
         """Get member's share percentage"""
-        for member in self.members:
-            if member.pubkey == pubkey:
-                return member.share_percentage
-        return None
+        return self._share_map.get(pubkey)
     
     def to_dict(self) -> dict:
         """Serialize vault to dictionary"""
-        return asdict(self)
+        return {
+            'members': [
+                {'pubkey': m.pubkey, 'share_percentage': m.share_percentage, 'join_height': m.join_height}
+                for m in self.members
+            ],
+            'total_balance': self.total_balance,
+            'created_height': self.created_height,
+            'vault_id': self.vault_id
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Vault':
@@ -94,15 +185,8 @@ class MultiPartyVault:
     
     def create_withdrawal_proof(self, request: 'WithdrawalRequest') -> 'GrailProof':
         """Create zk proof for withdrawal using Grail Pro interface"""
-        from .predicate import VaultPredicate
-        from .bos_stack.grail_pro import GrailProof
-        
-        # Validate request first
+        # GrailProof.generate validates the request and raises on failure
         predicate = VaultPredicate(self.vault, self.rules, request)
-        is_valid, reason = predicate.verify()
-        if not is_valid:
-            raise ValueError(f"Predicate verification failed: {reason}")
-        
         return GrailProof.generate(predicate, self.vault)
     
     def verify_withdrawal(self, proof: 'GrailProof') -> bool:
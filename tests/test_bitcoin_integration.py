@@ -0,0 +1,69 @@
+import unittest
+from src.bitcoin_integration import BitcoinKey
+
+class TestBitcoinKey(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.key = BitcoinKey()
+        self.pubkey_hex = self.key.get_public_key_hex()
+
+    def test_key_pair_format(self):
+        """Test generated keys use 32-byte secret and compressed pubkey"""
+        private_hex, public_hex = BitcoinKey.generate_key_pair()
+        self.assertEqual(len(bytes.fromhex(private_hex)), 32)
+        self.assertEqual(len(bytes.fromhex(public_hex)), 33)
+        self.assertIn(public_hex[:2], ('02', '03'))
+
+        # Restoring from the secret yields the same public key
+        restored = BitcoinKey(bytes.fromhex(private_hex))
+        self.assertEqual(restored.get_public_key_hex(), public_hex)
+
+    def test_generate_key_pairs(self):
+        """Test bulk key generation returns distinct valid pairs"""
+        pairs = BitcoinKey.generate_key_pairs(5)
+        self.assertEqual(len(pairs), 5)
+        self.assertEqual(len({public_hex for _, public_hex in pairs}), 5)
+
+        for private_hex, public_hex in pairs:
+            restored = BitcoinKey(bytes.fromhex(private_hex))
+            self.assertEqual(restored.get_public_key_hex(), public_hex)
+
+    def test_sign_and_verify(self):
+        """Test signature round-trip against the signer's public key"""
+        message = b"withdraw 5000000 sats"
+        signature = self.key.sign_message(message)
+
+        self.assertTrue(self.key.verify_signature(message, signature, self.pubkey_hex))
+        self.assertFalse(self.key.verify_signature(b"tampered", signature, self.pubkey_hex))
+
+        # Signature must not verify under another member's key
+        _, other_pubkey = BitcoinKey.generate_key_pair()
+        self.assertFalse(self.key.verify_signature(message, signature, other_pubkey))
+
+    def test_verify_batch(self):
+        """Test batch verification across several signers"""
+        keys = [BitcoinKey() for _ in range(3)]
+        messages = [b"proposal-1", b"proposal-2", b"proposal-3"]
+        signatures = [k.sign_message(m) for k, m in zip(keys, messages)]
+        pubkeys = [k.get_public_key_hex() for k in keys]
+
+        self.assertTrue(BitcoinKey.verify_batch(messages, signatures, pubkeys))
+
+        # One swapped signature fails the whole batch
+        swapped = [signatures[1], signatures[0], signatures[2]]
+        self.assertFalse(BitcoinKey.verify_batch(messages, swapped, pubkeys))
+
+        # Mismatched lengths are rejected
+        self.assertFalse(BitcoinKey.verify_batch(messages[:2], signatures, pubkeys))
+
+    def test_hash_helpers(self):
+        """Test HASH160 and double SHA256 output"""
+        self.assertEqual(len(BitcoinKey.hash160(b"vault")), 20)
+        self.assertEqual(
+            BitcoinKey.double_sha256(b"").hex(),
+            "5df6e0e2761359d30a8275058e299fcc0381534545f55cf43e41983f5d4c9456"
+        )
+
+if __name__ == '__main__':
+    unittest.main()
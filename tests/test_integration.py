@@ -1,10 +1,11 @@
+import hashlib
 import unittest
 from src.vault import Vault, VaultMember, MultiPartyVault
 from src.rules import WithdrawalRules
-from src.predicate import WithdrawalRequest
-from src.bos_stack.grail_pro import GrailProof
-from src.bos_stack.zkbtc import ZkBtcBridge, ChainId, CrossChainVerifier
-from src.bos_stack.charms import VaultToken, GovernanceSystem, ProposalType
+from src.predicate import VaultPredicate, WithdrawalRequest
+from src.bos_stack.grail_pro import GrailProof, ProofSystem, VaultCircuit
+from src.bos_stack.zkbtc import ZkBtcBridge, ChainId, CrossChainVerifier, BitcoinProof
+from src.bos_stack.charms import VaultToken, GovernanceSystem, ProposalType, IncrementalMerkle
 from src.bitcoin_integration import BitcoinKey
 
 class TestBOSIntegration(unittest.TestCase):
@@ -46,14 +47,54 @@ class TestBOSIntegration(unittest.TestCase):
 
         # Check withdrawal amount
         self.assertEqual(proof.get_withdrawal_amount(), 5_000_000)
+
+        # Proof verifies against the vault, and a tampered proof does not
+        self.assertTrue(self.vault.verify_withdrawal(proof))
+        tampered_data = proof.proof_data[:-1] + bytes([proof.proof_data[-1] ^ 0x01])
+        tampered = GrailProof(proof.predicate, tampered_data, proof.verification_key)
+        self.assertFalse(self.vault.verify_withdrawal(tampered))
+
+        # The verifier synthesizes its own circuit rather than trusting the prover's
+        self.assertIsNone(proof._verify_circuit._precomputed_valid)
+        outsider_request = WithdrawalRequest(5_000_000, 150, [BitcoinKey.generate_key_pair()[1]], False)
+        invalid = VaultPredicate(self.vault.vault, self.vault.rules, outsider_request)
+        forged_data = ProofSystem.prove(VaultCircuit(invalid, self.vault.vault, precomputed_valid=True))
+        forged = GrailProof(invalid, forged_data, proof.verification_key)
+        self.assertFalse(self.vault.verify_withdrawal(forged))
         
         # Verify predicate logic directly
-        from src.predicate import VaultPredicate
         predicate = VaultPredicate(self.vault.vault, self.vault.rules, request)
         is_valid, reason = predicate.verify()
         self.assertTrue(is_valid)
         self.assertEqual(reason, "Withdrawal approved")
 
+        # The cached result cannot go stale through the request
+        with self.assertRaises(AttributeError):
+            request.signers.append(self.pubkeys[0])
+        self.assertEqual(predicate.verify(), VaultPredicate(self.vault.vault, self.vault.rules, request).verify())
+
+        # Signer checks: non-members are reported before duplicates
+        outsider = BitcoinKey.generate_key_pair()[1]
+        bad_request = WithdrawalRequest(5_000_000, 150, [self.pubkeys[0], outsider, outsider], False)
+        is_valid, reason = VaultPredicate(self.vault.vault, self.vault.rules, bad_request).verify()
+        self.assertFalse(is_valid)
+        self.assertEqual(reason, f"Signer {outsider[:8]}... is not a vault member")
+        dup_request = WithdrawalRequest(5_000_000, 150, [self.pubkeys[0], self.pubkeys[0]], False)
+        self.assertEqual(
+            VaultPredicate(self.vault.vault, self.vault.rules, dup_request).verify(),
+            (False, "Duplicate signers not allowed")
+        )
+        for amount in (0, -5_000_000):
+            bad_amount = WithdrawalRequest(amount, 150, self.pubkeys[:2], False)
+            self.assertEqual(
+                VaultPredicate(self.vault.vault, self.vault.rules, bad_amount).verify(),
+                (False, "Withdrawal amount must be positive")
+            )
+
+        # State changes after construction are caught
+        self.vault.vault.total_balance += 1
+        self.assertEqual(predicate.verify(), (False, "Vault commitment mismatch"))
+
     def test_zkbtc_integration(self):
         """Test zkBTC cross-chain verification"""
         bridge = ZkBtcBridge.create_cross_chain_proof(
@@ -68,6 +109,15 @@ class TestBOSIntegration(unittest.TestCase):
         self.assertEqual(collateral['collateral_amount'], 50_000_000)
         self.assertIn('position_id', collateral)
 
+        proof = bridge.bitcoin_proof
+        self.assertEqual(BitcoinProof.deserialize(proof.serialize()), proof)
+
+        # Re-verifying a chain does not sync it twice; other vaults are untouched
+        self.assertTrue(bridge.verify_on_chain(verifier))
+        self.assertEqual(verifier.sync_vault_state(self.vault.vault.vault_id, 42), ['ethereum'])
+        self.assertEqual(verifier.get_verified_proof(self.vault.vault.vault_id, ChainId.ETHEREUM)['proof'].amount, 42)
+        self.assertEqual(verifier.sync_vault_state(self.vault.vault.vault_id[:8], 7), [])
+
     def test_charms_integration(self):
         """Test Charms token and governance integration"""
         token = VaultToken.create_for_vault(self.vault.vault)
@@ -81,6 +131,53 @@ class TestBOSIntegration(unittest.TestCase):
         self.assertEqual(token.balance_of(self.pubkeys[0]), 35_000_000)
         self.assertEqual(token.balance_of(self.pubkeys[1]), 40_000_000)
 
+        # Allowances are per (owner, spender) pair
+        self.assertTrue(token.approve(self.pubkeys[0], self.pubkeys[2], 1_000))
+        self.assertEqual(token.allowance(self.pubkeys[0], self.pubkeys[2]), 1_000)
+        self.assertEqual(token.allowance(self.pubkeys[2], self.pubkeys[0]), 0)
+        self.assertFalse(token.transfer_from(self.pubkeys[2], self.pubkeys[0], self.pubkeys[2], 2_000))
+        self.assertTrue(token.transfer_from(self.pubkeys[2], self.pubkeys[0], self.pubkeys[2], 400))
+        self.assertEqual(token.allowance(self.pubkeys[0], self.pubkeys[2]), 600)
+
+    def test_incremental_merkle_root(self):
+        """Test frontier Merkle root matches a full rebuild"""
+        def full_root(leaves):
+            level = [hashlib.sha256(leaf).digest() for leaf in leaves]
+            while len(level) > 1:
+                if len(level) % 2:
+                    level.append(level[-1])
+                level = [hashlib.sha256(level[i] + level[i + 1]).digest()
+                         for i in range(0, len(level), 2)]
+            return level[0]
+
+        tree = IncrementalMerkle()
+        self.assertEqual(tree.root(), bytes(32))
+
+        leaves = []
+        for i in range(1, 18):
+            leaf = f"transfer_{i}".encode()
+            leaves.append(leaf)
+            tree.append(leaf)
+            self.assertEqual(tree.root(), full_root(leaves))
+
+    def test_transfer_history_root(self):
+        """Test token transfers update the history commitment"""
+        token = VaultToken.create_for_vault(self.vault.vault)
+        empty_root = token.transfer_history_root()
+
+        token.transfer(self.pubkeys[0], self.pubkeys[1], 1_000)
+        first_root = token.transfer_history_root()
+        self.assertNotEqual(first_root, empty_root)
+
+        # Failed transfers are not recorded
+        token.transfer(self.pubkeys[2], self.pubkeys[0], 10**12)
+        self.assertEqual(token.transfer_history_root(), first_root)
+
+        token.transfer(self.pubkeys[1], self.pubkeys[2], 500)
+        self.assertEqual(len(token.get_transfer_history()), 2)
+        self.assertEqual(token.get_transfer_history(since_index=1)[0]['amount'], 500)
+        self.assertEqual([t['amount'] for t in token.iter_transfers()], [1_000, 500])
+
     def test_governance_system(self):
         """Test governance proposal and voting"""
         token = VaultToken.create_for_vault(self.vault.vault)
@@ -96,13 +193,44 @@ class TestBOSIntegration(unittest.TestCase):
         )
 
         self.assertTrue(governance.vote(proposal_id, self.pubkeys[0], True, 250))
+        self.assertEqual(governance.get_proposal_results(proposal_id)['total_voters'], 1)
         self.assertTrue(governance.vote(proposal_id, self.pubkeys[1], True, 250))
+        self.assertEqual(governance.get_proposal_results(proposal_id)['total_voters'], 2)
+        self.assertFalse(governance.vote(proposal_id, self.pubkeys[1], True, 260))  # already voted
+
+        self.assertEqual(
+            [p.proposal_id for p in governance.get_active_proposals(300)],
+            [proposal_id]
+        )
 
         self.assertTrue(governance.finalize_proposal(proposal_id, 1300))
+        self.assertEqual(governance.get_active_proposals(300), [])
 
         results = governance.get_proposal_results(proposal_id)
         self.assertTrue(results['passed'])
         self.assertGreaterEqual(results['votes_for_percentage'], 51.0)
+        self.assertEqual(results['status'], 'passed')
+        self.assertIs(governance.get_proposal_results(proposal_id), results)
+
+    def test_governance_exact_threshold(self):
+        """Test votes exactly at the required percentage pass"""
+        token = VaultToken.create_for_vault(self.vault.vault)
+        token.transfer(self.pubkeys[0], self.pubkeys[2], 4_000_000)  # 29% of supply
+        governance = GovernanceSystem(token, self.vault.vault)
+
+        proposal_id = governance.create_proposal(
+            proposer=self.pubkeys[2],
+            proposal_type=ProposalType.ADD_MEMBER,
+            title="Add member",
+            description="Threshold boundary",
+            proposal_data={},
+            current_height=200,
+            required_voting_power=29.0
+        )
+
+        self.assertTrue(governance.vote(proposal_id, self.pubkeys[2], True, 250))
+        self.assertTrue(governance.finalize_proposal(proposal_id, 1300))
+        self.assertTrue(governance.get_proposal_results(proposal_id)['passed'])
 
 if __name__ == '__main__':
     unittest.main()
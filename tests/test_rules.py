@@ -1,4 +1,5 @@
 import unittest
+from dataclasses import FrozenInstanceError, replace
 from src.rules import WithdrawalRules
 
 class TestWithdrawalRules(unittest.TestCase):
@@ -28,8 +29,7 @@ class TestWithdrawalRules(unittest.TestCase):
 
     def test_penalty_calculation(self):
         """Test penalty calculation"""
-        rules = self.conservative_rules
-        rules.penalty_free_height = 1000
+        rules = replace(self.conservative_rules, penalty_free_height=1000)
 
         # Before penalty-free height
         penalty = rules.calculate_penalty(100_000_000, 500)  # 1 BTC at height 500
@@ -63,5 +63,64 @@ class TestWithdrawalRules(unittest.TestCase):
         is_valid, reason = rules.validate_withdrawal(50_000_000, 3, 3)
         self.assertTrue(is_valid)
 
+    def test_compiled_check_matches_rules(self):
+        """Test the specialized checker agrees with the rule methods"""
+        rules = replace(self.conservative_rules, penalty_free_height=2_000)
+        check = rules.compile()
+
+        for amount in (1_000, 10_000_000, 50_000_000, 150_000_000):
+            for signers in (1, 2, 3):
+                for last_height in (None, 100, 1_000):
+                    expected_ok, expected_reason = rules.validate_withdrawal(amount, signers, 3)
+                    if expected_ok:
+                        expected_ok, cooling_reason = rules.check_cooling_period(1_050, last_height, amount)
+                        if not expected_ok:
+                            expected_reason = cooling_reason
+
+                    is_valid, reason = check(amount, signers, 3, 1_050, last_height)
+                    self.assertEqual(is_valid, expected_ok)
+                    if not expected_ok:
+                        self.assertEqual(reason, expected_reason)
+
+                    expected_penalty = rules.calculate_penalty(amount, 1_050) if expected_ok else 0
+                    self.assertEqual(
+                        rules.fused_check(amount, signers, 3, 1_050, last_height),
+                        (is_valid, reason, expected_penalty)
+                    )
+
+    def test_bulk_helpers_match_single_calls(self):
+        """Test bulk penalty and validation agree with per-item calls"""
+        rules = replace(self.conservative_rules, penalty_free_height=1000)
+        amounts = [1_000, 5_000_000, 20_000_000, 200_000_000]
+        heights = [500, 999, 1000, 1500]
+
+        self.assertEqual(
+            rules.bulk_calculate_penalty(amounts, heights),
+            [rules.calculate_penalty(a, h) for a, h in zip(amounts, heights)]
+        )
+
+        signers = [1, 2, 3, 3]
+        last_heights = [None, 900, 950, None]
+        expected = [
+            rules.compile()(a, s, 3, h, last)[0]
+            for a, s, h, last in zip(amounts, signers, heights, last_heights)
+        ]
+        self.assertEqual(rules.bulk_validate(amounts, signers, 3, heights, last_heights), expected)
+        self.assertEqual(expected, [False, True, False, False])
+
+    def test_rules_are_immutable(self):
+        """Test rules are frozen and changed copies get their own checker"""
+        rules = self.permissive_rules
+        with self.assertRaises(FrozenInstanceError):
+            rules.min_signers = 2
+
+        self.assertIs(rules.compile(), WithdrawalRules.permissive().compile())
+        self.assertTrue(rules.compile()(1_000, 1, 3, 0, None)[0])
+
+        stricter = replace(rules, min_signers=2)
+        is_valid, reason = stricter.compile()(1_000, 1, 3, 0, None)
+        self.assertFalse(is_valid)
+        self.assertIn("Need at least 2 signers", reason)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,7 @@
+import hashlib
+import pickle
 import unittest
+from dataclasses import FrozenInstanceError
 from src.vault import Vault, VaultMember, MultiPartyVault
 from src.rules import WithdrawalRules
 from src.predicate import WithdrawalRequest
@@ -56,5 +59,105 @@ class TestVault(unittest.TestCase):
         self.assertEqual(vault.vault.get_member_share(self.pubkeys[0]), 40)
         self.assertIsNone(vault.vault.get_member_share("invalid_key"))
 
+    def test_commitment_cache_invalidation(self):
+        """Test cached commitment hash tracks state changes"""
+        vault = Vault(self.members)
+        initial = vault.commitment_hash()
+        self.assertEqual(vault.commitment_hash(), initial)
+
+        vault.total_balance = 100_000_000
+        funded = vault.commitment_hash()
+        self.assertNotEqual(funded, initial)
+
+        vault.created_height = 100
+        self.assertNotEqual(vault.commitment_hash(), funded)
+
+    def test_commitment_hash_layout(self):
+        """Test commitment hash matches its reference preimage layout"""
+        vault = Vault(self.members)
+        vault.total_balance = 123_456_789
+        vault.created_height = 800_000
+
+        hasher = hashlib.blake2b(bytes.fromhex(vault.vault_id), digest_size=32, person=b"MPVAULT_CMT_V2")
+        for member in self.members:
+            hasher.update(bytes.fromhex(member.pubkey))
+            hasher.update(member.share_percentage.to_bytes(1, 'little'))
+            hasher.update(member.join_height.to_bytes(4, 'little'))
+        hasher.update(vault.total_balance.to_bytes(8, 'little'))
+        hasher.update(vault.created_height.to_bytes(4, 'little'))
+        self.assertEqual(vault.commitment_hash(), hasher.hexdigest())
+
+    def test_dict_round_trip(self):
+        """Test vault serializes to plain dicts and back"""
+        vault = Vault(self.members)
+        vault.total_balance = 5_000
+        vault.created_height = 42
+
+        data = vault.to_dict()
+        self.assertEqual(data['members'][0], {
+            'pubkey': self.pubkeys[0], 'share_percentage': 40, 'join_height': 100
+        })
+        restored = Vault.from_dict(data)
+        self.assertEqual(restored.to_dict(), data)
+        self.assertEqual(restored.commitment_hash(), vault.commitment_hash())
+
+    def test_pickle_round_trip(self):
+        """Test vaults survive pickling, which shared web storage relies on"""
+        vault = MultiPartyVault(self.members, WithdrawalRules.conservative())
+        vault.vault.total_balance = 7_000
+        commitment = vault.vault.commitment_hash()
+
+        restored = pickle.loads(pickle.dumps(vault))
+        self.assertEqual(restored.vault._commitment_cache, commitment)  # carried over, not recomputed
+        self.assertEqual(restored.vault.commitment_hash(), commitment)
+        self.assertTrue(restored.vault.is_member(self.pubkeys[1]))
+        self.assertEqual(restored.vault.members[0].pubkey_bytes, self.members[0].pubkey_bytes)
+
+    def test_proof_pickle_round_trip(self):
+        """Test proofs pickle with their predicate and still verify once restored"""
+        vault = MultiPartyVault(self.members, WithdrawalRules.conservative())
+        vault.vault.total_balance = 100_000_000
+        vault.vault.created_height = 100
+        proof = vault.create_withdrawal_proof(
+            WithdrawalRequest(5_000_000, 150, self.pubkeys[:2], False)
+        )
+
+        restored_vault, restored = pickle.loads(pickle.dumps((vault, proof)))
+        self.assertIs(restored.predicate.vault, restored_vault.vault)
+        self.assertEqual(restored_vault.vault._state_version, vault.vault._state_version)
+        self.assertEqual(restored.predicate.verify(), (True, "Withdrawal approved"))
+        self.assertTrue(restored_vault.verify_withdrawal(restored))
+        self.assertEqual(restored_vault.execute_withdrawal(restored)['remaining_balance'], 95_000_000)
+
+    def test_member_immutability(self):
+        """Test members cannot change after their encodings are cached"""
+        with self.assertRaises(FrozenInstanceError):
+            self.members[0].share_percentage = 50
+
+    def test_request_immutability(self):
+        """Test withdrawal requests are hashable and their signers fixed"""
+        request = WithdrawalRequest(1_000, 150, [self.pubkeys[0], self.pubkeys[1]], False)
+        self.assertEqual(request.signers, (self.pubkeys[0], self.pubkeys[1]))
+        self.assertEqual(hash(request), hash(WithdrawalRequest(1_000, 150, self.pubkeys[:2], False)))
+
+        with self.assertRaises(AttributeError):
+            request.signers.append(self.pubkeys[2])
+        with self.assertRaises(FrozenInstanceError):
+            request.signers = [self.pubkeys[2]]
+
+    def test_pubkey_canonicalization(self):
+        """Test pubkeys are canonicalized so hex case doesn't matter"""
+        upper = self.pubkeys[0].upper()
+        member = VaultMember(upper, 100, 100)
+        self.assertEqual(member.pubkey, self.pubkeys[0])
+
+        request = WithdrawalRequest(
+            amount=1_000,
+            current_height=150,
+            signers=[upper],
+            is_emergency=False
+        )
+        self.assertIs(request.signers[0], member.pubkey)
+
 if __name__ == '__main__':
     unittest.main()
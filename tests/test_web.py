@@ -0,0 +1,399 @@
+import json
+import logging
+import pickle
+import sys
+import types
+import unittest
+from unittest import mock
+from web_interface import app as web_app
+
+class FakeRedis:
+    """In-process stand-in for the redis-py calls RedisVaultStore makes"""
+
+    class WatchError(Exception):
+        pass
+
+    def __init__(self):
+        self.data = {}
+        self.writes = {}  # key -> write count, for WATCH conflict detection
+        self.reads = []
+
+    def module(self) -> types.ModuleType:
+        """A `redis` module whose clients all share this instance"""
+        fake = self
+        module = types.ModuleType('redis')
+        module.WatchError = FakeRedis.WatchError
+        module.BlockingConnectionPool = types.SimpleNamespace(from_url=lambda url, **kwargs: fake)
+        module.Redis = lambda connection_pool: fake
+        return module
+
+    def get(self, key):
+        self.reads.append(key)
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+        self.writes[key] = self.writes.get(key, 0) + 1
+
+    def incr(self, key):
+        self.set(key, str(int(self.data.get(key, 0)) + 1).encode())
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+class FakePipeline:
+    """Transaction pipeline: immediate after watch(), buffered after multi()"""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._watched = {}
+        self._buffered = []
+        self._immediate = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        self._watched[key] = self._redis.writes.get(key, 0)
+        self._immediate = True
+
+    def get(self, key):
+        return self._redis.get(key)
+
+    def multi(self):
+        self._immediate = False
+
+    def set(self, key, value):
+        self._buffered.append(('set', key, value))
+
+    def incr(self, key):
+        self._buffered.append(('incr', key))
+
+    def execute(self):
+        ops, self._buffered = self._buffered, []
+        watched, self._watched = self._watched, {}
+        if any(self._redis.writes.get(k, 0) != n for k, n in watched.items()):
+            raise FakeRedis.WatchError()
+        for op, key, *args in ops:
+            getattr(self._redis, op)(key, *args)
+
+class TestWebInterface(unittest.TestCase):
+
+    def make_store(self):
+        return web_app.MemoryVaultStore()
+
+    def setUp(self):
+        """Set up a test client over a fresh store"""
+        self._saved_store = web_app.store
+        web_app.store = self.make_store()
+        self.client = web_app.app.test_client()
+
+        response = self.client.post('/api/create_vault', json={
+            'members': [
+                {'name': 'Alice', 'share': 40},
+                {'name': 'Bob', 'share': 35},
+                {'name': 'Carol', 'share': 25}
+            ],
+            'initial_balance': 100_000_000
+        })
+        self.assertEqual(response.status_code, 200)
+        self.vault_id = response.get_json()['vault_id']
+        self.pubkeys = [m['public_key'] for m in response.get_json()['members']]
+
+    def tearDown(self):
+        web_app.store = self._saved_store
+
+    def test_vault_etag_revalidation(self):
+        """Test unchanged vaults answer 304, including encoding-suffixed tags"""
+        url = f'/api/vault/{self.vault_id}'
+        response = self.client.get(url, headers={'Accept-Encoding': 'br, gzip'})
+        self.assertEqual(response.status_code, 200)
+        etag, _ = response.get_etag()
+        self.assertEqual(response.headers['Cache-Control'], 'private, must-revalidate')
+
+        # The tag exactly as returned (suffixed when Flask-Compress is active)
+        response = self.client.get(url, headers={'Accept-Encoding': 'br, gzip', 'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        # Flask-Compress's ":br" / ":gzip" forms of the same representation
+        base = etag.partition(':')[0]
+        for suffix in (':br', ':gzip'):
+            response = self.client.get(url, headers={'Accept-Encoding': 'br, gzip', 'If-None-Match': f'"{base}{suffix}"'})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.get_etag(), (base + suffix, False))
+
+        # Weak validators are echoed back weak
+        response = self.client.get(url, headers={'Accept-Encoding': 'br, gzip', 'If-None-Match': f'W/"{base}:br"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], f'W/"{base}:br"')
+
+        # A withdrawal changes the representation
+        response = self.client.post(f'{url}/withdraw', json={'amount': 5_000_000, 'signers': self.pubkeys[:2]})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={'Accept-Encoding': 'br, gzip', 'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_etag()[0].partition(':')[0], base)
+
+    def test_invalid_input_is_client_error(self):
+        """Test malformed field values get a 400 envelope, not a 500"""
+        withdraw_url = f'/api/vault/{self.vault_id}/withdraw'
+        bad_withdrawals = [
+            {'amount': -5, 'signers': self.pubkeys[:2]},
+            {'amount': 1.5, 'signers': self.pubkeys[:2]},
+            {'amount': True, 'signers': self.pubkeys[:2]},
+            {'amount': 2**70, 'signers': self.pubkeys[:2]},
+            {'amount': 1_000, 'signers': [1, 2]},
+            {'amount': 1_000, 'signers': self.pubkeys[0]},
+            {'amount': 1_000, 'signers': self.pubkeys[:2], 'current_height': -1},
+            {'amount': 0, 'signers': self.pubkeys[:2]}
+        ]
+        for body in bad_withdrawals:
+            response = self.client.post(withdraw_url, data=json.dumps(body), content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
+            self.assertFalse(response.get_json()['success'])
+
+        members = [{'name': 'Alice', 'share': 50}, {'name': 'Bob', 'share': 50}]
+        for extra in ({'initial_balance': -5}, {'initial_balance': '5'}):
+            response = self.client.post('/api/create_vault', json={'members': members, **extra})
+            self.assertEqual(response.status_code, 400, extra)
+        response = self.client.post('/api/create_vault', json={
+            'members': [{'name': 'Alice', 'share': 50.5}, {'name': 'Bob', 'share': 49.5}]
+        })
+        self.assertEqual(response.status_code, 400)
+
+        oversized = [{'name': f'm{i}', 'share': 0} for i in range(web_app.MAX_VAULT_MEMBERS)]
+        oversized.append({'name': 'last', 'share': 100})
+        response = self.client.post('/api/create_vault', json={'members': oversized})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('members', response.get_json()['error'])
+
+        response = self.client.post('/api/create_vault', json={'members': [{'name': 7, 'share': 100}]})
+        self.assertEqual(response.get_json()['error'], 'name must be a string')
+        response = self.client.post('/api/create_vault', json={'members': ['Alice']})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(withdraw_url, json={'amount': 1_000, 'signers': self.pubkeys[:2], 'is_emergency': 'yes'})
+        self.assertEqual(response.get_json()['error'], 'is_emergency must be true or false')
+
+        propose_url = f'/api/vault/{self.vault_id}/governance/propose'
+        proposal = {'proposer': self.pubkeys[0], 'proposal_type': 'add_member', 'title': 't', 'description': 'd'}
+        for bad, error in (
+            ({'proposer': None}, 'proposer must be a string'),
+            ({'proposal_type': ['add_member']}, 'proposal_type must be a string'),
+            ({'proposal_data': [1]}, 'proposal_data must be an object'),
+            ({'current_height': -1}, f'current_height must be an integer between 0 and {web_app.MAX_HEIGHT}')
+        ):
+            response = self.client.post(propose_url, json={**proposal, **bad})
+            self.assertEqual((response.status_code, response.get_json()['error']), (400, error))
+
+        proposal_id = self.client.post(propose_url, json=proposal).get_json()['proposal_id']
+        vote_url = f'/api/vault/{self.vault_id}/governance/vote'
+        vote = {'proposal_id': proposal_id, 'voter': self.pubkeys[0], 'vote_for': True}
+        for bad, error in (
+            ({'vote_for': 'yes'}, 'vote_for must be true or false'),
+            ({'voter': ['x']}, 'voter must be a string'),
+            ({'current_height': 'soon'}, f'current_height must be an integer between 0 and {web_app.MAX_HEIGHT}')
+        ):
+            response = self.client.post(vote_url, json={**vote, **bad})
+            self.assertEqual((response.status_code, response.get_json()['error']), (400, error))
+        response = self.client.post(vote_url, json={k: v for k, v in vote.items() if k != 'vote_for'})
+        self.assertEqual(response.get_json()['error'], 'vote_for is required')
+        self.assertTrue(self.client.post(vote_url, json=vote).get_json()['success'])
+
+        # Rejected requests leave the vault untouched
+        self.assertEqual(self.client.get(f'/api/vault/{self.vault_id}').get_json()['balance'], 100_000_000)
+
+    def test_error_envelope(self):
+        """Test missing vaults, rule failures and crashes use the JSON error envelope"""
+        missing = '00' * 32
+        for method, url in (
+            ('get', f'/api/vault/{missing}'),
+            ('post', f'/api/vault/{missing}/withdraw'),
+            ('post', f'/api/vault/{missing}/governance/propose'),
+            ('post', f'/api/vault/{missing}/governance/vote'),
+            ('get', f'/api/vault/{missing}/governance/proposals')
+        ):
+            body = {'amount': 1_000, 'signers': [], 'proposer': 'x', 'proposal_type': 'add_member',
+                    'title': 't', 'description': 'd', 'proposal_id': 'p', 'voter': 'x', 'vote_for': True}
+            response = getattr(self.client, method)(url, json=body) if method == 'post' else self.client.get(url)
+            self.assertEqual(response.status_code, 404, url)
+            self.assertEqual(response.get_json(), {'success': False, 'error': 'Vault not found'})
+
+        # Domain rule failure: large withdrawals need every signer
+        response = self.client.post(f'/api/vault/{self.vault_id}/withdraw', json={
+            'amount': 50_000_000, 'signers': self.pubkeys[:2]
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Large withdrawal requires all 3 signers", response.get_json()['error'])
+
+        # Missing field
+        response = self.client.post(f'/api/vault/{self.vault_id}/withdraw', json={'signers': self.pubkeys})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {'success': False, 'error': 'amount is required'})
+
+        # Unexpected failures are 500s without internal details
+        with mock.patch.object(web_app.store, 'get', side_effect=RuntimeError('boom')), \
+                self.assertLogs(web_app.logger, level='ERROR'):
+            response = self.client.get(f'/api/vault/{self.vault_id}')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json(), {'success': False, 'error': 'Internal server error'})
+
+        # Internal lookup or call bugs are not mistaken for client errors
+        for error in (KeyError('vote_for'), TypeError('bad call')):
+            with mock.patch.object(web_app.store, 'get', side_effect=error), \
+                    self.assertLogs(web_app.logger, level='ERROR'):
+                response = self.client.get(f'/api/vault/{self.vault_id}')
+            self.assertEqual(response.status_code, 500)
+            self.assertEqual(response.get_json()['error'], 'Internal server error')
+
+        # Non-API routes keep Flask's own error pages
+        self.assertEqual(self.client.get('/no-such-page').status_code, 404)
+
+    def test_json_body(self):
+        """Test request bodies are parsed once and malformed ones rejected"""
+        url = f'/api/vault/{self.vault_id}/withdraw'
+        cases = (
+            ('{bad', 'Malformed JSON body'),
+            ('[1, 2]', 'JSON body must be an object'),
+            ('', 'amount is required')  # empty body reads as {}
+        )
+        for raw, error in cases:
+            response = self.client.post(url, data=raw, content_type='application/json')
+            self.assertEqual(response.status_code, 400, raw)
+            self.assertEqual(response.get_json()['error'], error)
+
+        # Non-JSON content types are refused before the body is read
+        body = json.dumps({'amount': 1_000, 'signers': self.pubkeys[:2]})
+        for content_type in ('text/plain', 'application/x-www-form-urlencoded', None):
+            response = self.client.post(url, data=body, content_type=content_type)
+            self.assertEqual(response.status_code, 415, content_type)
+            self.assertEqual(response.get_json()['error'], 'Request body must be application/json')
+        for endpoint in ('governance/propose', 'governance/vote'):
+            response = self.client.post(f'/api/vault/{self.vault_id}/{endpoint}', data='{}', content_type='text/plain')
+            self.assertEqual(response.status_code, 415, endpoint)
+
+        response = self.client.post(url, data=body, content_type='application/json; charset=utf-8')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['remaining_balance'], 100_000_000 - 1_000)
+
+    def test_proposals_pagination(self):
+        """Test the proposals listing pages through columnar results"""
+        ids = []
+        for i in range(3):
+            response = self.client.post(f'/api/vault/{self.vault_id}/governance/propose', json={
+                'proposer': self.pubkeys[0], 'proposal_type': 'add_member',
+                'title': f'Proposal {i}', 'description': 'd'
+            })
+            self.assertEqual(response.status_code, 200)
+            ids.append(response.get_json()['proposal_id'])
+
+        response = self.client.post(f'/api/vault/{self.vault_id}/governance/vote', json={
+            'proposal_id': ids[1], 'voter': self.pubkeys[0], 'vote_for': True
+        })
+        self.assertTrue(response.get_json()['success'])
+
+        url = f'/api/vault/{self.vault_id}/governance/proposals'
+        page = self.client.get(url).get_json()
+        self.assertEqual(page['count'], 3)
+        self.assertIsNone(page['next_offset'])
+        self.assertEqual(page['cols']['proposal_id'], ids)
+        self.assertEqual(page['cols']['votes_for_percentage'], [0.0, 40.0, 0.0])
+        self.assertEqual(set(page['cols']), {
+            'proposal_id', 'title', 'description', 'proposal_type', 'status',
+            'votes_for_percentage', 'votes_against_percentage', 'required_percentage'
+        })
+        for column in page['cols'].values():
+            self.assertEqual(len(column), 3)
+
+        page = self.client.get(url + '?limit=2').get_json()
+        self.assertEqual((page['cols']['proposal_id'], page['next_offset']), (ids[:2], 2))
+        page = self.client.get(url + '?limit=2&offset=2').get_json()
+        self.assertEqual((page['cols']['proposal_id'], page['next_offset']), (ids[2:], None))
+        page = self.client.get(url + '?offset=10').get_json()
+        self.assertEqual((page['count'], page['cols']['title'], page['next_offset']), (0, [], None))
+
+        # Out-of-range bounds are clamped
+        page = self.client.get(url + '?limit=0&offset=-5').get_json()
+        self.assertEqual((page['cols']['proposal_id'], page['next_offset']), (ids[:1], 1))
+        page = self.client.get(url + '?limit=100000').get_json()
+        self.assertEqual(page['count'], 3)
+
+        # Proposals past their voting period drop out
+        self.assertEqual(self.client.get(url + '?current_height=5000').get_json()['count'], 0)
+
+    def test_log_level_configuration(self):
+        """Test LOG_LEVEL names are applied and unknown ones fall back to WARNING"""
+        saved = web_app.logger.level
+        try:
+            web_app.configure_log_level('debug')
+            self.assertEqual(web_app.logger.level, logging.DEBUG)
+
+            # assertLogs restores the level on exit, so check it inside
+            with self.assertLogs(web_app.logger, level='DEBUG') as logs:
+                web_app.configure_log_level('verbose')
+                self.assertEqual(web_app.logger.level, logging.WARNING)
+            self.assertIn("Unknown LOG_LEVEL 'verbose'", logs.output[0])
+        finally:
+            web_app.logger.setLevel(saved)
+
+class TestWebInterfaceRedis(TestWebInterface):
+    """The same endpoint tests over RedisVaultStore, plus store-level checks"""
+
+    def make_store(self):
+        self.redis = FakeRedis()
+        with mock.patch.dict(sys.modules, {'redis': self.redis.module()}):
+            return web_app.RedisVaultStore('redis://localhost:6379/0')
+
+    def test_decode_cache_follows_version(self):
+        """Test unchanged records decode once and writes bump the version"""
+        store = web_app.store
+        record_key = f'vault:{self.vault_id}'
+        version_key = f'vault:{self.vault_id}:version'
+        self.assertEqual(self.redis.data[version_key], b'1')
+
+        self.redis.reads.clear()
+        first = store.get(self.vault_id)
+        self.assertIs(store.get(self.vault_id), first)
+        self.assertEqual(self.redis.reads.count(record_key), 1)
+
+        response = self.client.post(f'/api/vault/{self.vault_id}/withdraw', json={
+            'amount': 5_000_000, 'signers': self.pubkeys[:2]
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.redis.data[version_key], b'2')
+
+        updated = store.get(self.vault_id)
+        self.assertIsNot(updated, first)
+        self.assertEqual(updated['vault'].vault.total_balance, 95_000_000)
+        self.assertEqual(first['vault'].vault.total_balance, 100_000_000)  # cached copies are never mutated
+
+        self.assertIsNone(store.get('ff' * 32))
+
+    def test_update_retries_on_concurrent_write(self):
+        """Test a write landing between WATCH and EXEC makes update re-run"""
+        store = web_app.store
+        calls = []
+
+        def mutate(record):
+            calls.append(record['vault'].vault.total_balance)
+            if len(calls) == 1:
+                # Another worker commits first (on its own decoded copy)
+                concurrent = pickle.loads(self.redis.data[f'vault:{self.vault_id}'])
+                concurrent['vault'].vault.total_balance = 1_000
+                store.add(self.vault_id, concurrent)
+            record['vault'].vault.total_balance += 1
+            return len(calls)
+
+        self.assertEqual(store.update(self.vault_id, mutate), 2)
+        self.assertEqual(calls, [100_000_000, 1_000])
+        self.assertEqual(store.get(self.vault_id)['vault'].vault.total_balance, 1_001)
+
+        with self.assertRaises(web_app.VaultNotFound):
+            store.update('ff' * 32, mutate)
+
+if __name__ == '__main__':
+    unittest.main()
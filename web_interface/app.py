@@ -4,9 +4,16 @@ Web interface for Multi-Party Smart Vault
 """
 
 from flask import Flask, render_template, request, jsonify, session
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException, UnsupportedMediaType
+import functools
 import json
+import logging
 import os
+import pickle
+import queue
 import sys
+import threading
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,13 +24,321 @@ from src.predicate import WithdrawalRequest
 from src.bitcoin_integration import BitcoinKey
 from src.bos_stack.charms import VaultToken, GovernanceSystem, ProposalType
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; Flask's default provider is used
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional; responses are sent uncompressed
+    Compress = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson, writing bytes straight into responses"""
+    
+    # Sorted keys match the output of Flask's default provider
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS if orjson else 0
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option), mimetype=self.mimetype)
+
+logger = logging.getLogger(__name__)
+
+def configure_log_level(level_name: str):
+    """Set the app logger's level by name, falling back to WARNING if unknown"""
+    try:
+        logger.setLevel(level_name.upper())
+    except ValueError:
+        logger.setLevel(logging.WARNING)
+        logger.warning("Unknown LOG_LEVEL %r; using WARNING", level_name)
+
+configure_log_level(os.environ.get('LOG_LEVEL', 'WARNING'))
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.secret_key = 'demo_secret_key_change_in_production'
 
-# Global storage (in production, use proper database)
-vaults = {}
-governance_systems = {}
-vault_keys = {}  # Store member keys separately
+if Compress is not None:
+    # Brotli where the client accepts it, gzip otherwise; tiny bodies skipped
+    app.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_LEVEL=4,
+        COMPRESS_MIN_SIZE=512
+    )
+    Compress(app)
+
+class VaultError(Exception):
+    """Request failure reported to the client as a JSON error"""
+    status = 400
+
+class VaultNotFound(VaultError, LookupError):
+    """No stored record for the requested vault"""
+    status = 404
+    
+    def __init__(self, vault_id: str):
+        super().__init__('Vault not found')
+        self.vault_id = vault_id
+
+def json_body(view):
+    """Parse the request body once and pass it to the view as data
+    
+    Only application/json bodies are accepted, which also keeps these
+    state-changing endpoints out of CORS "simple requests".
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not request.is_json:
+            raise UnsupportedMediaType("Request body must be application/json")
+        body = request.get_data(cache=False) or b'{}'
+        try:
+            data = orjson.loads(body) if orjson is not None else json.loads(body)
+        except ValueError:
+            raise VaultError('Malformed JSON body') from None
+        if not isinstance(data, dict):
+            raise VaultError('JSON body must be an object')
+        return view(*args, data=data, **kwargs)
+    return wrapper
+
+# Bounds for client-supplied integers; the proof and commitment encodings
+# pack amounts as uint64 and heights as uint32
+MAX_SATOSHIS = 21_000_000 * 100_000_000
+MAX_HEIGHT = 2**32 - 1
+
+# Field helpers: a missing field without a default is a client error
+_REQUIRED = object()
+
+def _field(data: dict, name: str, default):
+    if name in data:
+        return data[name]
+    if default is _REQUIRED:
+        raise VaultError(f"{name} is required")
+    return default
+
+def int_field(data: dict, name: str, maximum: int, default=_REQUIRED) -> int:
+    """data[name] as an int in [0, maximum]"""
+    value = _field(data, name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= maximum:
+        raise VaultError(f"{name} must be an integer between 0 and {maximum}")
+    return value
+
+def str_field(data: dict, name: str, default=_REQUIRED):
+    """data[name] as a string; a None default makes the field nullable"""
+    value = _field(data, name, default)
+    if value is None and default is None:
+        return None
+    if not isinstance(value, str):
+        raise VaultError(f"{name} must be a string")
+    return value
+
+def bool_field(data: dict, name: str, default=_REQUIRED) -> bool:
+    """data[name] as a JSON boolean"""
+    value = _field(data, name, default)
+    if not isinstance(value, bool):
+        raise VaultError(f"{name} must be true or false")
+    return value
+
+def signers_field(data: dict) -> list:
+    """data['signers'] as a list of hex public key strings"""
+    signers = _field(data, 'signers', _REQUIRED)
+    if not isinstance(signers, list) or not all(isinstance(s, str) for s in signers):
+        raise VaultError("signers must be a list of public key strings")
+    return signers
+
+@app.errorhandler(VaultError)
+@app.errorhandler(ValueError)
+def handle_request_error(e):
+    """Invalid requests (VaultError) and domain rule failures (ValueError from src)"""
+    logger.warning("%s %s failed: %s", request.method, request.path, e)
+    return jsonify({'success': False, 'error': str(e)}), getattr(e, 'status', 400)
+
+@app.errorhandler(HTTPException)
+def handle_http_error(e):
+    """Keep API errors (e.g. malformed JSON bodies) in the JSON envelope"""
+    if not request.path.startswith('/api/'):
+        return e
+    return jsonify({'success': False, 'error': e.description}), e.code
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    logger.exception("Unhandled error in %s %s", request.method, request.path)
+    return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
+class MemoryVaultStore:
+    """Per-process vault storage (single worker only)
+    
+    Each record is a dict holding the MultiPartyVault ('vault'), its
+    governance 'token' and 'governance' system, and the member 'keys'.
+    """
+    
+    def __init__(self):
+        self._records = {}
+        self._locks = {}  # vault_id -> Lock serializing mutations
+    
+    def get(self, vault_id: str):
+        return self._records.get(vault_id)
+    
+    def add(self, vault_id: str, record: dict):
+        self._records[vault_id] = record
+    
+    def update(self, vault_id: str, mutate):
+        """Apply mutate(record) under the vault's lock and return its result"""
+        with self._locks.setdefault(vault_id, threading.Lock()):
+            record = self._records.get(vault_id)
+            if record is None:
+                raise VaultNotFound(vault_id)
+            return mutate(record)
+
+class RedisVaultStore:
+    """Vault storage shared by all workers through Redis
+    
+    Records are pickled whole so the vault, token and governance objects
+    keep their shared references. Redis must be a trusted store.
+    
+    Every write bumps a per-vault version counter, and reads decode each
+    (vault_id, version) at most once per process via an LRU cache. Records
+    returned by get() may be shared between requests and must not be
+    mutated; writes go through update(), which always decodes afresh.
+    """
+    
+    DECODE_CACHE_SIZE = 1024
+    # Per worker; with gevent, requests beyond this wait for a free connection
+    MAX_CONNECTIONS = 50
+    
+    def __init__(self, url: str):
+        import redis
+        pool = redis.BlockingConnectionPool.from_url(url, max_connections=self.MAX_CONNECTIONS)
+        self._redis = redis.Redis(connection_pool=pool)
+        self._watch_error = redis.WatchError
+        self._decode = functools.lru_cache(maxsize=self.DECODE_CACHE_SIZE)(self._fetch)
+    
+    @staticmethod
+    def _key(vault_id: str) -> str:
+        return f"vault:{vault_id}"
+    
+    @staticmethod
+    def _version_key(vault_id: str) -> str:
+        return f"vault:{vault_id}:version"
+    
+    def _fetch(self, vault_id: str, version: bytes):
+        data = self._redis.get(self._key(vault_id))
+        return pickle.loads(data) if data is not None else None
+    
+    def get(self, vault_id: str):
+        version = self._redis.get(self._version_key(vault_id))
+        if version is None:
+            # Unknown vault, or a record written before versions existed
+            return self._fetch(vault_id, None)
+        return self._decode(vault_id, version)
+    
+    def add(self, vault_id: str, record: dict):
+        with self._redis.pipeline() as pipe:
+            pipe.set(self._key(vault_id), pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+            pipe.incr(self._version_key(vault_id))
+            pipe.execute()
+    
+    def update(self, vault_id: str, mutate):
+        """Apply mutate(record) and write it back, retrying on concurrent writes"""
+        key = self._key(vault_id)
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    data = pipe.get(key)
+                    if data is None:
+                        raise VaultNotFound(vault_id)
+                    record = pickle.loads(data)
+                    result = mutate(record)
+                    pipe.multi()
+                    pipe.set(key, pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+                    pipe.incr(self._version_key(vault_id))
+                    pipe.execute()
+                    return result
+                except self._watch_error:
+                    continue
+
+def create_store():
+    """Redis-backed store when VAULT_REDIS_URL is set, else in-process"""
+    redis_url = os.environ.get('VAULT_REDIS_URL')
+    if redis_url:
+        return RedisVaultStore(redis_url)
+    return MemoryVaultStore()
+
+store = create_store()
+
+# Key pairs pregenerated off the request path by a background thread
+KEY_POOL_SIZE = 64
+KEY_POOL_BATCH = 16
+# Keeps key generation for one request small and in-process (bulk keygen
+# switches to a process pool far above this)
+MAX_VAULT_MEMBERS = 100
+_key_pool = queue.Queue(maxsize=KEY_POOL_SIZE)
+_key_pool_thread = None
+_key_pool_lock = threading.Lock()
+
+def _fill_key_pool():
+    while True:
+        for pair in BitcoinKey.generate_key_pairs(KEY_POOL_BATCH):
+            _key_pool.put(pair)  # blocks while the pool is full
+
+def next_key_pairs(count: int) -> list:
+    """Take `count` pregenerated key pairs, generating any shortfall in one batch"""
+    global _key_pool_thread
+    # Started on first use rather than at import so forked workers get their own
+    if _key_pool_thread is None:
+        with _key_pool_lock:
+            if _key_pool_thread is None:
+                _key_pool_thread = threading.Thread(target=_fill_key_pool, name='key-pool', daemon=True)
+                _key_pool_thread.start()
+    pairs = []
+    try:
+        while len(pairs) < count:
+            pairs.append(_key_pool.get_nowait())
+    except queue.Empty:
+        pairs.extend(BitcoinKey.generate_key_pairs(count - len(pairs)))
+    return pairs
+
+def build_members_info(members, keys_info) -> list:
+    """Public member listing for get_vault: pubkey, share and name if known"""
+    members_info = []
+    for i, member in enumerate(members):
+        member_info = {
+            'pubkey': member.pubkey,
+            'share': member.share_percentage
+        }
+        # Add name if available from stored keys
+        if i < len(keys_info):
+            member_info['name'] = keys_info[i]['name']
+        members_info.append(member_info)
+    return members_info
+
+def _matching_etag(etag: str):
+    """The If-None-Match validator naming this representation as (tag, weak), or None
+    
+    Flask-Compress suffixes the ETag of compressed responses with the
+    encoding (e.g. ":br", ":gzip") and may mark it weak, so clients echo
+    that form back; it is returned unchanged for the 304.
+    """
+    tags = request.if_none_match
+    if tags.star_tag:
+        return etag, False
+    for tag in tags.as_set(include_weak=True):
+        if tag.partition(':')[0] == etag:
+            return tag, tags.is_weak(tag)
+    return None
+
+# Page bounds for the proposals listing
+PROPOSALS_PAGE_SIZE = 50
+PROPOSALS_MAX_PAGE_SIZE = 200
 
 @app.route('/')
 def index():
@@ -31,135 +346,143 @@ def index():
     return render_template('index.html')
 
 @app.route('/api/create_vault', methods=['POST'])
-def create_vault():
+@json_body
+def create_vault(data):
     """Create new multi-party vault"""
-    try:
-        data = request.json
-        
-        # Generate keys for members
-        members = []
-        keys_info = []
-        
-        for member_data in data['members']:
-            private_hex, public_hex = BitcoinKey.generate_key_pair()
-            
-            member = VaultMember(
-                pubkey=public_hex,
-                share_percentage=member_data['share'],
-                join_height=100
-            )
-            members.append(member)
-            
-            keys_info.append({
-                'name': member_data['name'],
-                'public_key': public_hex,
-                'private_key': private_hex,
-                'share': member_data['share']
-            })
-        
-        # Create rules
-        if data.get('rules_type') == 'permissive':
-            rules = WithdrawalRules.permissive()
-        else:
-            rules = WithdrawalRules.conservative()
-        
-        # Create vault
-        vault = MultiPartyVault(members, rules)
-        vault.vault.total_balance = data.get('initial_balance', 100_000_000)
-        vault.vault.created_height = 100
-        
-        # Store vault and keys
-        vault_id = vault.vault.vault_id
-        vaults[vault_id] = vault
-        vault_keys[vault_id] = keys_info  # Store keys separately
-        
-        # Create governance token
-        token = VaultToken.create_for_vault(vault.vault)
-        governance = GovernanceSystem(token, vault.vault)
-        governance_systems[vault_id] = {'token': token, 'governance': governance}
-        
-        print(f"DEBUG: Created vault {vault_id} with members: {[m.pubkey for m in members]}")
+    # Generate keys for members
+    members = []
+    keys_info = []
+    
+    member_list = _field(data, 'members', _REQUIRED)
+    if not isinstance(member_list, list) or not 0 < len(member_list) <= MAX_VAULT_MEMBERS:
+        raise VaultError(f"members must be a list of 1 to {MAX_VAULT_MEMBERS} entries")
+    if not all(isinstance(m, dict) for m in member_list):
+        raise VaultError("members entries must be objects")
+    for member_data, (private_hex, public_hex) in zip(member_list, next_key_pairs(len(member_list))):
+        share = int_field(member_data, 'share', 100)
+        member = VaultMember(
+            pubkey=public_hex,
+            share_percentage=share,
+            join_height=100
+        )
+        members.append(member)
         
-        return jsonify({
-            'success': True,
-            'vault_id': vault_id,
-            'commitment_hash': vault.vault.commitment_hash(),
-            'balance': vault.vault.total_balance,
-            'members': keys_info,
-            'rules': {
-                'min_signers': rules.min_signers,
-                'large_threshold': rules.large_withdrawal_threshold,
-                'penalty_rate': rules.early_withdrawal_penalty_bps / 100
-            }
+        keys_info.append({
+            'name': str_field(member_data, 'name'),
+            'public_key': public_hex,
+            'private_key': private_hex,
+            'share': share
         })
-        
-    except Exception as e:
-        print(f"ERROR creating vault: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # Create rules
+    if data.get('rules_type') == 'permissive':
+        rules = WithdrawalRules.permissive()
+    else:
+        rules = WithdrawalRules.conservative()
+    
+    # Create vault
+    vault = MultiPartyVault(members, rules)
+    vault.vault.total_balance = int_field(data, 'initial_balance', MAX_SATOSHIS, default=100_000_000)
+    vault.vault.created_height = 100
+    
+    # Create governance token
+    vault_id = vault.vault.vault_id
+    token = VaultToken.create_for_vault(vault.vault)
+    governance = GovernanceSystem(token, vault.vault)
+    
+    # Store vault, governance, keys and the public member listing as one record
+    store.add(vault_id, {
+        'vault': vault,
+        'token': token,
+        'governance': governance,
+        'keys': keys_info,
+        'members_info': build_members_info(members, keys_info)
+    })
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Created vault %s with members: %s", vault_id, [m.pubkey for m in members])
+    
+    return jsonify({
+        'success': True,
+        'vault_id': vault_id,
+        'commitment_hash': vault.vault.commitment_hash(),
+        'balance': vault.vault.total_balance,
+        'members': keys_info,
+        'rules': {
+            'min_signers': rules.min_signers,
+            'large_threshold': rules.large_withdrawal_threshold,
+            'penalty_rate': rules.early_withdrawal_penalty_bps / 100
+        }
+    })
 
 @app.route('/api/vault/<vault_id>')
 def get_vault(vault_id):
     """Get vault information"""
-    if vault_id not in vaults:
-        return jsonify({'error': 'Vault not found'}), 404
+    record = store.get(vault_id)
+    if record is None:
+        raise VaultNotFound(vault_id)
     
-    vault = vaults[vault_id]
-    gov_data = governance_systems.get(vault_id)
-    keys_data = vault_keys.get(vault_id, [])
+    vault = record['vault']
+    keys_data = record['keys']
     
-    # Include member public keys for reference
-    members_info = []
-    for i, member in enumerate(vault.vault.members):
-        member_info = {
-            'pubkey': member.pubkey,
-            'share': member.share_percentage
-        }
-        # Add name if available from stored keys
-        if i < len(keys_data):
-            member_info['name'] = keys_data[i]['name']
-        members_info.append(member_info)
+    # The commitment pins members and balance; the history length covers
+    # withdrawals that leave the balance unchanged
+    history = vault.get_withdrawal_history()
+    etag = f"{vault.vault.commitment_hash()}-{len(history)}"
+    matched = _matching_etag(etag)
+    if matched is not None:
+        tag, weak = matched
+        response = app.response_class(status=304)
+        response.set_etag(tag, weak=weak)
+        return response
+    
+    # Built at creation; records stored before that are rebuilt here
+    members_info = record.get('members_info')
+    if members_info is None:
+        members_info = build_members_info(vault.vault.members, keys_data)
     
     vault_info = {
         'vault_id': vault_id,
         'balance': vault.vault.total_balance,
         'members': members_info,  # Now includes pubkeys and names
         'commitment_hash': vault.vault.commitment_hash(),
-        'withdrawal_history': vault.get_withdrawal_history()
+        'withdrawal_history': history
     }
     
-    if gov_data:
-        token = gov_data['token']
+    token = record['token']
+    if token is not None:
         vault_info['token'] = {
             'name': token.metadata.name,
             'symbol': token.metadata.symbol,
             'total_supply': token.total_supply
         }
     
-    print(f"DEBUG: Returning vault info for {vault_id}: {len(members_info)} members")
-    return jsonify(vault_info)
+    logger.debug("Returning vault info for %s: %d members", vault_id, len(members_info))
+    response = jsonify(vault_info)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, must-revalidate'
+    return response
 
 @app.route('/api/vault/<vault_id>/withdraw', methods=['POST'])
-def create_withdrawal(vault_id):
+@json_body
+def create_withdrawal(vault_id, data):
     """Create withdrawal from vault"""
-    if vault_id not in vaults:
-        return jsonify({'error': 'Vault not found'}), 404
-    
-    try:
-        data = request.json
-        vault = vaults[vault_id]
+    def withdraw(record):
+        vault = record['vault']
         
-        print(f"DEBUG: Withdrawal request for vault {vault_id}")
-        print(f"DEBUG: Amount: {data['amount']}")
-        print(f"DEBUG: Signers: {data['signers']}")
-        print(f"DEBUG: Vault members: {[m.pubkey for m in vault.vault.members]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Withdrawal request for vault %s", vault_id)
+            logger.debug("Amount: %s", data.get('amount'))
+            logger.debug("Signers: %s", data.get('signers'))
+            logger.debug("Vault members: %s", [m.pubkey for m in vault.vault.members])
         
         # Create withdrawal request
         request_obj = WithdrawalRequest(
-            amount=data['amount'],
-            current_height=data.get('current_height', 150),
-            signers=data['signers'],
-            is_emergency=data.get('is_emergency', False),
-            recipient_address=data.get('recipient_address')
+            amount=int_field(data, 'amount', MAX_SATOSHIS),
+            current_height=int_field(data, 'current_height', MAX_HEIGHT, default=150),
+            signers=signers_field(data),
+            is_emergency=bool_field(data, 'is_emergency', default=False),
+            recipient_address=str_field(data, 'recipient_address', default=None)
         )
         
         # Generate proof
@@ -167,98 +490,97 @@ def create_withdrawal(vault_id):
         
         # Execute withdrawal
         result = vault.execute_withdrawal(proof)
-        
-        return jsonify({
-            'success': True,
-            'withdrawal_amount': result['withdrawal_amount'],
-            'remaining_balance': result['remaining_balance'],
-            'transaction_id': result['transaction_id'],
-            'penalty': proof.get_penalty_amount()
-        })
-        
-    except Exception as e:
-        print(f"ERROR in withdrawal: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return result, proof.get_penalty_amount()
+    
+    result, penalty = store.update(vault_id, withdraw)
+    
+    return jsonify({
+        'success': True,
+        'withdrawal_amount': result['withdrawal_amount'],
+        'remaining_balance': result['remaining_balance'],
+        'transaction_id': result['transaction_id'],
+        'penalty': penalty
+    })
 
 @app.route('/api/vault/<vault_id>/governance/propose', methods=['POST'])
-def create_proposal(vault_id):
+@json_body
+def create_proposal(vault_id, data):
     """Create governance proposal"""
-    if vault_id not in vaults or vault_id not in governance_systems:
-        return jsonify({'error': 'Vault or governance not found'}), 404
+    proposal_data = _field(data, 'proposal_data', {})
+    if not isinstance(proposal_data, dict):
+        raise VaultError("proposal_data must be an object")
+    fields = dict(
+        proposer=str_field(data, 'proposer'),
+        proposal_type=ProposalType(str_field(data, 'proposal_type')),
+        title=str_field(data, 'title'),
+        description=str_field(data, 'description'),
+        proposal_data=proposal_data,
+        current_height=int_field(data, 'current_height', MAX_HEIGHT, default=200)
+    )
     
-    try:
-        data = request.json
-        governance = governance_systems[vault_id]['governance']
-        
-        proposal_id = governance.create_proposal(
-            proposer=data['proposer'],
-            proposal_type=ProposalType(data['proposal_type']),
-            title=data['title'],
-            description=data['description'],
-            proposal_data=data.get('proposal_data', {}),
-            current_height=data.get('current_height', 200)
-        )
-        
-        return jsonify({
-            'success': True,
-            'proposal_id': proposal_id
-        })
-        
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+    def propose(record):
+        return record['governance'].create_proposal(**fields)
+    
+    proposal_id = store.update(vault_id, propose)
+    
+    return jsonify({
+        'success': True,
+        'proposal_id': proposal_id
+    })
 
 @app.route('/api/vault/<vault_id>/governance/vote', methods=['POST'])
-def vote_proposal(vault_id):
+@json_body
+def vote_proposal(vault_id, data):
     """Vote on governance proposal"""
-    if vault_id not in governance_systems:
-        return jsonify({'error': 'Governance not found'}), 404
+    fields = dict(
+        proposal_id=str_field(data, 'proposal_id'),
+        voter=str_field(data, 'voter'),
+        vote_for=bool_field(data, 'vote_for'),
+        current_height=int_field(data, 'current_height', MAX_HEIGHT, default=250)
+    )
     
-    try:
-        data = request.json
-        governance = governance_systems[vault_id]['governance']
-        
-        success = governance.vote(
-            proposal_id=data['proposal_id'],
-            voter=data['voter'],
-            vote_for=data['vote_for'],
-            current_height=data.get('current_height', 250)
-        )
-        
-        return jsonify({'success': success})
-        
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+    def vote(record):
+        return record['governance'].vote(**fields)
+    
+    success = store.update(vault_id, vote)
+    
+    return jsonify({'success': success})
 
 @app.route('/api/vault/<vault_id>/governance/proposals')
 def get_proposals(vault_id):
     """Get governance proposals"""
-    if vault_id not in governance_systems:
-        return jsonify({'error': 'Governance not found'}), 404
+    record = store.get(vault_id)
+    if record is None:
+        raise VaultNotFound(vault_id)
     
-    governance = governance_systems[vault_id]['governance']
+    governance = record['governance']
     current_height = request.args.get('current_height', 300, type=int)
+    limit = min(max(request.args.get('limit', PROPOSALS_PAGE_SIZE, type=int), 1), PROPOSALS_MAX_PAGE_SIZE)
+    offset = max(request.args.get('offset', 0, type=int), 0)
     
+    # Active proposals are in creation order, so offsets are stable between polls
     active_proposals = governance.get_active_proposals(current_height)
+    page = active_proposals[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(active_proposals) else None
     
-    proposals_data = []
-    for proposal in active_proposals:
-        results = governance.get_proposal_results(proposal.proposal_id)
-        proposals_data.append({
-            'proposal_id': proposal.proposal_id,
-            'title': proposal.title,
-            'description': proposal.description,
-            'proposal_type': proposal.proposal_type.value,
-            'status': proposal.status.value,
-            'votes_for_percentage': results.get('votes_for_percentage', 0),
-            'votes_against_percentage': results.get('votes_against_percentage', 0),
-            'required_percentage': proposal.required_voting_power
-        })
+    # Columnar layout: one array per field, index i is the i-th proposal
+    results = [governance.get_proposal_results(p.proposal_id) for p in page]
+    cols = {
+        'proposal_id': [p.proposal_id for p in page],
+        'title': [p.title for p in page],
+        'description': [p.description for p in page],
+        'proposal_type': [p.proposal_type.value for p in page],
+        'status': [p.status.value for p in page],
+        'votes_for_percentage': [r.get('votes_for_percentage', 0) for r in results],
+        'votes_against_percentage': [r.get('votes_against_percentage', 0) for r in results],
+        'required_percentage': [p.required_voting_power for p in page]
+    }
     
-    return jsonify({'proposals': proposals_data})
-
-import os
+    return jsonify({'cols': cols, 'count': len(page), 'next_offset': next_offset})
 
 if __name__ == "__main__":
+    # Development server; deploy with gunicorn -c gunicorn_conf.py web_interface.app:app
+    logging.basicConfig()
     port = int(os.environ.get("PORT", 10000))
     app.run(
         host="0.0.0.0",
@@ -424,13 +424,22 @@ async function loadProposals() {
         if (response.ok) {
             const proposalsList = document.getElementById('proposals-list');
             
-            if (result.proposals.length === 0) {
+            if (result.count === 0) {
                 proposalsList.innerHTML = '<p>No active proposals</p>';
                 return;
             }
             
+            // Rebuild one object per proposal from the columnar response
+            const fields = Object.keys(result.cols);
+            const proposals = [];
+            for (let i = 0; i < result.count; i++) {
+                const proposal = {};
+                fields.forEach(field => { proposal[field] = result.cols[field][i]; });
+                proposals.push(proposal);
+            }
+            
             let proposalsHtml = '';
-            result.proposals.forEach(proposal => {
+            proposals.forEach(proposal => {
                 proposalsHtml += `
                     <div class="proposal-item">
                         <h4>${proposal.title}</h4>